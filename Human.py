@@ -1,26 +1,208 @@
 """Module containing all Human classes."""
 
 from general_funcs import print_line
+from population_store import COLUMNS, StoreField
 
 
-def get_room_index(room, rooms):
-    """Get index of room in room list.
+def name_key(first_name, surname):
+    """Normalize a name for looking inhabitants up.
 
     Arguments:
-    room -- room to get index of
-    rooms -- list of all rooms in the game
+    first_name -- first name of inhabitant
+    surname -- surname of inhabitant
 
     Returns:
-    r -- index of room
+    tuple -- (first name, surname), both capitalized
     """
-    for r in range(len(rooms)):
-        if rooms[r].name == room:
-            return r
-    return -1
+    return first_name.capitalize(), surname.capitalize()
+
+
+class Population(object):
+    """Registry of all inhabitants, indexed by name and by person ID.
+
+    Iterates and indexes like the list of people it replaces, in the order
+    people were added. Bulk loads may leave by_name as None; it is then
+    rebuilt on the first lookup by name. They may also defer() creating the
+    inhabitants until order, by_id or positions is first used.
+    """
+
+    # Attributes a deferred load fills in on first use.
+    DEFERRED = ("order", "by_id", "positions")
+
+    def __init__(self, store=None):
+        """Population constructor.
+
+        Arguments:
+        store -- PopulationStore to keep everyone's stats in (default: None)
+        """
+        self.store = store
+        self.by_id = {}
+        self.by_name = {}
+        self.positions = {}
+        self.order = []
+        self.next_id = 0
+        self.loader = None
+
+    def __getattr__(self, name):
+        """Create the inhabitants of a deferred load when they are first needed."""
+        loader = self.__dict__.get("loader")
+        if loader is None or name not in self.DEFERRED:
+            raise AttributeError(name)
+        loader.load()
+        return getattr(self, name)
+
+    def __len__(self):
+        """Number of inhabitants."""
+        if self.loader is not None:
+            return self.loader.size
+        return len(self.order)
+
+    def __iter__(self):
+        """Iterate over inhabitants in the order they were added."""
+        return iter(self.order)
+
+    def __getitem__(self, index):
+        """Get inhabitant (or a list of them, for a slice) by position."""
+        return self.order[index]
+
+    def __contains__(self, person):
+        """Check if person is a current inhabitant."""
+        return self.by_id.get(person.person_id) is person
+
+    def add(self, person):
+        """Register a new inhabitant and give them a person ID if they have none.
+
+        Arguments:
+        person -- Human to add
+        """
+        if person.person_id is None:
+            person.person_id = self.next_id
+        self.next_id = max(self.next_id, person.person_id + 1)
+        self.by_id[person.person_id] = person
+        if self.by_name is not None:
+            self.by_name[name_key(person.name, person.surname)] = person
+        self.positions[person.person_id] = len(self.order)
+        self.order.append(person)
+        if self.store is not None:
+            self.store.attach(person)
+
+    def remove(self, person):
+        """Remove an inhabitant.
+
+        Arguments:
+        person -- Human to remove
+        """
+        del self.by_id[person.person_id]
+        if self.store is not None:
+            self.store.detach(person)
+        key = name_key(person.name, person.surname)
+        if self.by_name is not None and self.by_name.get(key) is person:
+            del self.by_name[key]
+        position = self.positions.pop(person.person_id)
+        del self.order[position]
+        for x in range(position, len(self.order)):
+            self.positions[self.order[x].person_id] = x
+
+    def remove_many(self, people):
+        """Remove several inhabitants, rebuilding the order once.
+
+        Removing people one by one shifts everyone after each of them, so a
+        day of mass deaths would take time quadratic in the population.
+
+        Arguments:
+        people -- Humans to remove
+        """
+        if len(people) == 1:
+            self.remove(people[0])
+            return
+        if self.store is not None:
+            self.store.detach_many(people)
+        for person in people:
+            del self.by_id[person.person_id]
+            key = name_key(person.name, person.surname)
+            if self.by_name is not None and self.by_name.get(key) is person:
+                del self.by_name[key]
+        by_id = self.by_id
+        self.order = [person for person in self.order if by_id.get(person.person_id) is person]
+        self.positions = {person.person_id: x for x, person in enumerate(self.order)}
+
+    def find(self, first_name, surname):
+        """Look an inhabitant up by name.
+
+        Arguments:
+        first_name -- first name of inhabitant
+        surname -- surname of inhabitant
+
+        Returns:
+        person -- matching inhabitant, or None
+        """
+        if self.by_name is None:
+            self.by_name = {name_key(person.name, person.surname): person for person in self.order}
+        return self.by_name.get(name_key(first_name, surname))
+
+    def get(self, person_id):
+        """Look an inhabitant up by person ID.
+
+        Arguments:
+        person_id -- ID of inhabitant
+
+        Returns:
+        person -- matching inhabitant, or None
+        """
+        return self.by_id.get(person_id)
+
+    def index(self, person):
+        """Get position of an inhabitant.
+
+        Arguments:
+        person -- Human to look for
+
+        Returns:
+        int -- position of person
+        """
+        return self.positions[person.person_id]
+
+    def defer(self, loader):
+        """Leave the inhabitants to be created on first use.
+
+        Arguments:
+        loader -- object with the number of inhabitants as size, and a
+                  load() method setting order, by_id and positions, and
+                  the people of the store if there is one
+        """
+        for name in self.DEFERRED:
+            self.__dict__.pop(name, None)
+        self.loader = loader
+        if self.store is not None:
+            self.store.defer(loader)
 
 
 class Human(object):
-    """Basic class for all humans in game."""
+    """Basic class for all humans in game.
+
+    Attributes are declared in __slots__, so Humans carry no per-instance
+    __dict__. The StoreField stats keep their own values in the underscored
+    slots while the Human isn't attached to a PopulationStore.
+    """
+
+    __slots__ = (
+        "store", "row", "person_id", "name", "day_of_birth", "parent_1",
+        "parent_2", "gender", "surname", "partner", "assigned_room",
+        "children", "defense",
+    ) + tuple("_" + column for column in COLUMNS)
+
+    strength = StoreField("strength")
+    perception = StoreField("perception")
+    endurance = StoreField("endurance")
+    charisma = StoreField("charisma")
+    intelligence = StoreField("intelligence")
+    luck = StoreField("luck")
+    hunger = StoreField("hunger")
+    thirst = StoreField("thirst")
+    HP = StoreField("HP")
+    XP = StoreField("XP")
+    level = StoreField("level")
+    age = StoreField("age")
 
     def __init__(self, first_name, day_of_birth, parent_1, parent_2, age, gender):
         """Constructor for Human class.
@@ -33,6 +215,9 @@ class Human(object):
         age -- age of Human
         gender -- gender of Human
         """
+        self.store = None
+        self.row = None
+        self.person_id = None
         self.name = first_name
         self.day_of_birth = day_of_birth
         self.parent_1 = parent_1
@@ -57,6 +242,7 @@ class Human(object):
         self.children = []
         self.partner = ""
         self.level = 1
+        self.defense = 0
 
     def __str__(self):
         """String representation of object, first name and last name.
@@ -93,13 +279,13 @@ class Human(object):
             attribute = max(attributes, key=attributes.get)
             attributes[attribute] += 1
 
-    def heal(self, amount):
+    def heal(self, amount, player):
         """Heal Human.
 
         Arguments:
         amount -- amount of health to give
+        player -- player object
         """
-        player = people[0]
         if player.medic > 0:  # Medic Boost.
             amount *= 1 + (0.05 * player.medic)
         self.HP += amount
@@ -121,49 +307,30 @@ class Human(object):
         """Return index of Human in list of all people.
 
         Arguments:
-        people -- list of all people in the game
+        people -- Population of all people in the game
 
         Returns:
         x -- index of Human in list
         """
-        for x in range(len(people)):
-            if people[x].name == self.name and people[x].surname == self.surname:
-                return int(x)
+        return people.index(self)
 
-    def unassign(self, people):
+    def unassign(self, assignments):
         """Unassign Human from room.
 
         Arguments:
-        people -- list of all people in the game
+        assignments -- AssignmentIndex of the game
         """
-        for room in rooms:
-            string_room_name = str(room.assigned)
-            lst = list(string_room_name)
-            lst[self.get_index(people)] = '0'
-            room.assigned = ''.join(lst)
-        self.assigned_room = ''
+        assignments.unassign(self)
 
-    def assign_to_room(self, chosen_room, people, rooms):
+    def assign_to_room(self, room, assignments):
         """Assign Human to room.
 
         Arguments:
-        chosen_room -- room to assign to
-        people -- list of all people in the game
-        rooms -- list of all rooms in the game
+        room -- Room to assign to
+        assignments -- AssignmentIndex of the game
         """
-        person_index = self.get_index(people)
-        room_index = get_room_index(chosen_room, rooms)
-        room = rooms[room_index]
-
-        if self.assigned_room != '':
-            self.unassign(people)
-
-        string = str(room.assigned)
-        lst = list(string)
-        lst[person_index] = '1'
-        room.assigned = ''.join(lst)
-        self.assigned_room = str(chosen_room)
-        print_line(f"{self.name} {self.surname} has been assigned to {chosen_room}")
+        assignments.assign(self, room)
+        print_line(f"{self.name} {self.surname} has been assigned to {room.name}")
 
     def can_mate(self):
         """Check if Human meets requirements to have children.
@@ -193,6 +360,8 @@ class Human(object):
 class NPC(Human):
     """NPC class, inherits Human attributes."""
 
+    __slots__ = ("scavenging", "days_scavenging", "days_to_scavenge_for")
+
     def __init__(self, first_name, day_of_birth, parent_1, parent_2, age, gender):
         """NPC class constructor.
 
@@ -209,25 +378,26 @@ class NPC(Human):
         self.days_scavenging = 0
         self.days_to_scavenge_for = 0
 
-    def die(self):
-        """Kill NPC."""
-        global people
-        global rooms
+    def die(self, people, assignments):
+        """Kill NPC.
+
+        Arguments:
+        people -- Population of all people in the game
+        assignments -- AssignmentIndex of the game
+        """
         print_line(self.name, " has died")
-        if self.assigned_room != "":
-            for x in range(len(people)):  # Fetches the index of the person.
-                if people[x].name == self.name:
-                    index = x
-                    break
-            for r in rooms:
-                # Removes person from the rooms' assigned records.
-                r.assigned = r.assigned[:index] + r.assigned[index+1:]
+        assignments.unassign(self)
         people.remove(self)
 
 
 class Player(Human):
     """Player class, inherits Human attributes."""
 
+    __slots__ = (
+        "medic", "crafting", "tactician", "cooking", "barter", "inspiration",
+        "scrapper", "electrician",
+    )
+
     def __init__(self, first_name, day_of_birth, parent_1, parent_2, age, gender):
         """Player class constructor.
 
@@ -0,0 +1,193 @@
+"""Module containing the Inventory class."""
+
+from collections import Counter
+import random
+
+from Item import catalog
+
+
+class Inventory(object):
+    """Item storage keeping a count per item instead of one entry per unit."""
+
+    def __init__(self, items=None):
+        """Inventory constructor.
+
+        Arguments:
+        items -- mapping of item name to count to start with (default: None)
+        """
+        self.counts = Counter()
+        self.size = 0
+        self.weight = 0
+        self.value = 0
+        if items:
+            self.add_many(items)
+
+    def __len__(self):
+        """Total number of units held."""
+        return self.size
+
+    def __contains__(self, item):
+        """Check if at least one unit of item is held."""
+        return self.counts[item] > 0
+
+    def __iter__(self):
+        """Iterate over the names of held items."""
+        return iter(list(self.counts))
+
+    def items(self):
+        """Get held items and their counts.
+
+        Returns:
+        list -- (name, count) pairs
+        """
+        return list(self.counts.items())
+
+    def count(self, item):
+        """Count units of item held.
+
+        Arguments:
+        item -- name of item to count
+
+        Returns:
+        int -- number of units held
+        """
+        return self.counts[item]
+
+    def check(self, item, number):
+        """Check that a change is in whole units of a known item.
+
+        Arguments:
+        item -- name of item
+        number -- amount of item
+
+        Returns:
+        tuple -- (ItemRecord of item, number as an int)
+        """
+        record = catalog.record(item)
+        if record is None:
+            raise ValueError(f"Unknown item: {item}")
+        if number != int(number):
+            raise ValueError(f"Items only come in whole units, not {number} {item}")
+        return record, int(number)
+
+    def add(self, item, number=1):
+        """Add units of item.
+
+        Arguments:
+        item -- name of item to add
+        number -- amount of item to add (default: 1)
+        """
+        record, number = self.check(item, number)
+        if number <= 0:
+            return
+        self.counts[item] += number
+        self.size += number
+        self.weight += record.weight * number
+        self.value += record.value * number
+
+    def add_many(self, items):
+        """Add several items at once.
+
+        Arguments:
+        items -- mapping of item name to count
+        """
+        for item, number in items.items():
+            self.add(item, number)
+
+    def remove(self, item, number=1):
+        """Remove up to number units of item.
+
+        Arguments:
+        item -- name of item to remove
+        number -- amount of item to remove (default: 1)
+
+        Returns:
+        int -- number of units actually removed
+        """
+        record, number = self.check(item, number)
+        held = self.counts[item]
+        removed = min(held, number)
+        if removed <= 0:
+            return 0
+        if removed == held:
+            del self.counts[item]
+        else:
+            self.counts[item] = held - removed
+        self.size -= removed
+        self.weight -= record.weight * removed
+        self.value -= record.value * removed
+        return removed
+
+    def remove_many(self, items):
+        """Remove several items at once.
+
+        Arguments:
+        items -- mapping of item name to count
+
+        Returns:
+        dict -- number of units actually removed per item
+        """
+        return {item: self.remove(item, number) for item, number in items.items()}
+
+    def exchange(self, gained, spent):
+        """Add and remove several items as one change.
+
+        Nothing changes unless every unit to remove is held once the added
+        units are in, so a failed exchange leaves the inventory as it was.
+
+        Arguments:
+        gained -- mapping of item name to count to add
+        spent -- mapping of item name to count to remove
+
+        Returns:
+        bool -- whether the exchange was made
+        """
+        change = Counter(gained)
+        change.subtract(spent)
+        for item, number in change.items():
+            self.check(item, number)
+        if any(self.counts[item] + number < 0 for item, number in change.items()):
+            return False
+        for item, number in change.items():
+            if number > 0:
+                self.add(item, number)
+            elif number < 0:
+                self.remove(item, -number)
+        return True
+
+    def has_all(self, items):
+        """Check if every item is held in the requested amount.
+
+        Arguments:
+        items -- mapping of item name to count
+
+        Returns:
+        bool -- whether all items are available
+        """
+        return all(self.counts[item] >= number for item, number in items.items())
+
+    def pop_random(self, rng=None):
+        """Remove one randomly chosen unit, every unit being equally likely.
+
+        Arguments:
+        rng -- random.Random to draw with (default: None, the random module)
+
+        Returns:
+        str -- name of removed item, or None if inventory is empty
+        """
+        if not self.size:
+            return None
+        index = (rng if rng is not None else random).randrange(self.size)
+        for item, held in self.counts.items():
+            if index < held:
+                self.remove(item)
+                return item
+            index -= held
+
+    def total_weight(self):
+        """Weight of all held units."""
+        return self.weight
+
+    def total_value(self):
+        """Value of all held units."""
+        return self.value
@@ -1,32 +1,123 @@
 """Module containing all Item classes."""
 
-from random import randint
+from collections import Counter, namedtuple
+import random
 from general_funcs import print_line
 import json
 from config import ITEMS_FILE
+from rng import binomial
+
+
+ItemRecord = namedtuple("ItemRecord", ["name", "value", "weight", "components", "rarity"])
+
+
+class ItemCatalog(object):
+    """Process-wide catalog of every item in the items file."""
+
+    def __init__(self, path=ITEMS_FILE):
+        """ItemCatalog constructor. The items file is read on first use.
+
+        Arguments:
+        path -- path to the items JSON file (default: ITEMS_FILE)
+        """
+        self.path = path
+        self.records = None
+        self.items = {}
+        self.hits = 0
+        self.misses = 0
+
+    def reload(self):
+        """Read the items file again and drop every shared Item."""
+        with open(self.path) as f:
+            parsed = json.load(f)
+        self.records = {
+            name: ItemRecord(name, item['value'], item['weight'], tuple(item['components']), item['rarity'])
+            for name, item in parsed.items()}
+        self.items = {}
+
+    def record(self, name):
+        """Get the immutable record of an item.
+
+        Arguments:
+        name -- name of item
+
+        Returns:
+        ItemRecord -- record of item, or None if it doesn't exist
+        """
+        if self.records is None:
+            self.reload()
+        return self.records.get(name)
+
+    def names(self):
+        """Get the names of all items in the catalog.
+
+        Returns:
+        list -- names of all items
+        """
+        if self.records is None:
+            self.reload()
+        return list(self.records)
+
+    def item(self, name):
+        """Get the shared Item object for an item name.
+
+        Arguments:
+        name -- name of item
+
+        Returns:
+        Item -- shared Item object
+        """
+        it = self.items.get(name)
+        if it is not None:
+            self.hits += 1
+            return it
+        self.misses += 1
+        it = object.__new__(Item)
+        it.name = name
+        record = self.record(name)
+        if record:
+            it.value = record.value
+            it.weight = record.weight
+            it.components = record.components
+            it.rarity = record.rarity
+            self.items[name] = it
+        else:
+            print_line("Unknown item. This is a bug. Please contact the dev.")
+        return it
+
+    def stats(self):
+        """Report how often Item lookups were served from the catalog.
+
+        Returns:
+        dict -- hit and miss counts
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+
+catalog = ItemCatalog()
 
 
 class Item(object):
-    """Item class. Only used for on-the-fly cases, not storage."""
+    """Item class. Only used for on-the-fly cases, not storage.
+
+    Item(name) returns the shared object held by the catalog, so it is cheap
+    to call in loops and must not be modified.
+    """
+
+    def __new__(cls, name):
+        """Fetch Item from the catalog.
+
+        Arguments:
+        name -- name of item
+        """
+        return catalog.item(name)
 
     def __init__(self, name):
-        """Item constructor.
+        """Item constructor. Attributes are filled in by the catalog.
 
         Arguments:
         name -- name of item
         """
-        self.name = name
-        with open(ITEMS_FILE) as f:
-            parsed = json.load(f)
-            item = parsed.get(self.name)
-            if item:
-                self.value = item['value']
-                self.weight = item['weight']
-                self.components = item['components']
-                self.rarity = item['rarity']
-            else:
-                print_line("Unknown item. This is a bug. Please contact the dev.")
-        self.scrapped = False
 
     def count_component(self, component):
         """Count number of components in Item.
@@ -36,31 +127,50 @@ class Item(object):
         """
         return self.components.count(str(component))
 
-    def scrap(self):
-        """Destroy Item and add its components to inventory."""
-        global inventory
-        print_line(f"{self.name} has been scrapped and these components have been added to your inventory:")
+    def scrap(self, inventory, player, rng=None, number=1):
+        """Destroy units of Item and add their components to inventory.
+
+        The scrapper bonus is rolled for every unit with one binomial draw,
+        and the inventory is changed once.
+
+        Arguments:
+        inventory -- Inventory holding the Item
+        player -- player object
+        rng -- random.Random to roll the scrapper bonus with (default: None, the random module)
+        number -- units to scrap (default: 1)
+
+        Returns:
+        int -- number of units scrapped, 0 if fewer are held
+        """
+        if number <= 0 or inventory.count(self.name) < number:
+            return 0
+        # A unit's bonus comes when randint(0, 101) rolls under scrapper * 3.
+        chance = min(max(player.scrapper * 3, 0), 102) / 102
+        bonus = binomial(rng if rng is not None else random, number, chance)
+        gained = Counter()
         for item in self.components:
-            inventory.append(item)
-            print_line(item)
+            gained[item] += number + bonus
+        inventory.exchange(gained, {self.name: number})
 
-        chance = randint(0, 101)
-        if people[0].scrapper * 3 > chance:
+        if number == 1:
+            print_line(f"{self.name} has been scrapped and these components have been added to your inventory:")
+        else:
+            print_line(f"{number} {self.name} have been scrapped and these components have been added to your inventory:")
+        for item, units in gained.items():
+            print_line(item if units == 1 else f"{units} {item}")
+        if bonus:
             print_line("Your scrapper skill has allowed you to gain more components!")
-            for item in self.components:
-                inventory.append(item)
-        self.scrapped = True
-        self.destroy("player")
+        return number
 
-    def destroy(self, target_inventory):
-        """Remove item from inventory.
+    def destroy(self, target_inventory, number=1):
+        """Remove units of Item from inventory.
 
         Arguments:
-        target_inventory -- inventory to remove Item from
+        target_inventory -- Inventory to remove Item from
+        number -- amount of Item to remove (default: 1)
+
+        Returns:
+        int -- number of units actually removed
         """
-        global inventory
-        global trader_inventory
-        if target_inventory == "player":
-            inventory = [x for x in inventory if Item(x).name != self.name]
-        elif target_inventory == "trader":
-            trader_inventory = [x for x in trader_inventory if Item(x).name != self.name]
\ No newline at end of file
+        return target_inventory.remove(self.name, number)
+
@@ -3,9 +3,213 @@
 from general_funcs import print_line
 from Item import Item
 
+# Stat each production room runs on and the player perk that boosts it.
+PRODUCTION_CONFIG = {
+    "generator": {
+        "attribute": "strength",
+        "base_value": 10,
+        "player_bonus": "electrician",
+        "bonus_multiplier": 0.05
+    },
+    "kitchen": {
+        "attribute": "intelligence",
+        "base_value": 10,
+        "player_bonus": "cooking",
+        "bonus_multiplier": 0.05
+    },
+    "water works": {
+        "attribute": "perception",
+        "base_value": 10,
+        "player_bonus": "cooking",
+        "bonus_multiplier": 0.05
+    },
+    "radio": {
+        "attribute": "charisma",
+        "base_value": 10,
+        "player_bonus": "inspiration",
+        "bonus_multiplier": 0.05
+    }
+}
+
+
+class AssignmentIndex(object):
+    """Two-way index of which inhabitant works in which room, keyed by person ID.
+
+    Each Room keeps the set of person IDs assigned to it and the index keeps
+    the room of each person ID, so assigning, unassigning and counting are
+    all O(1).
+    """
+
+    def __init__(self):
+        """AssignmentIndex constructor."""
+        self.room_of = {}
+
+    def assign(self, person, room):
+        """Assign inhabitant to room, taking them out of their previous room.
+
+        Arguments:
+        person -- Human to assign
+        room -- Room to assign to
+        """
+        self.unassign(person)
+        room.assigned.add(person.person_id)
+        room.invalidate()
+        self.room_of[person.person_id] = room
+        person.assigned_room = room.name
+
+    def unassign(self, person):
+        """Take inhabitant out of their room.
+
+        Arguments:
+        person -- Human to unassign
+
+        Returns:
+        room -- Room they were assigned to, or None
+        """
+        room = self.room_of.pop(person.person_id, None)
+        if room is not None:
+            room.assigned.discard(person.person_id)
+            room.invalidate()
+        person.assigned_room = ""
+        return room
+
+    def room(self, person):
+        """Get room an inhabitant is assigned to.
+
+        Arguments:
+        person -- Human to look up
+
+        Returns:
+        room -- Room they are assigned to, or None
+        """
+        return self.room_of.get(person.person_id)
+
+    def count(self, room):
+        """Count inhabitants assigned to room.
+
+        Arguments:
+        room -- Room to count in
+
+        Returns:
+        int -- number of inhabitants assigned
+        """
+        return len(room.assigned)
+
+
+class RoomRegistry(object):
+    """Registry of built rooms, keyed by room type and by room ID.
+
+    Keeps running totals of power usage and storage, updated as rooms are
+    built and upgraded. Iterates like the list of rooms it replaces, in the
+    order rooms were built.
+    """
+
+    def __init__(self):
+        """RoomRegistry constructor."""
+        self.by_id = {}
+        self.by_type = {}
+        self.next_id = 0
+        self.total_power_usage = 0
+        self.total_storage = 0
+
+    def __len__(self):
+        """Number of built rooms."""
+        return len(self.by_id)
+
+    def __iter__(self):
+        """Iterate over rooms in the order they were built."""
+        return iter(list(self.by_id.values()))
+
+    def add(self, room):
+        """Register a built room and give it a room ID if it has none.
+
+        Arguments:
+        room -- Room to add
+        """
+        if room.room_id is None:
+            room.room_id = self.next_id
+        self.next_id = max(self.next_id, room.room_id + 1)
+        self.by_id[room.room_id] = room
+        self.by_type.setdefault(room.name, []).append(room)
+        self.total_power_usage += room.power_usage
+        self.total_storage += room.storage_capacity()
+
+    def upgrade(self, room):
+        """Upgrade a room and update the running totals.
+
+        Arguments:
+        room -- Room to upgrade
+        """
+        self.total_power_usage -= room.power_usage
+        self.total_storage -= room.storage_capacity()
+        room.upgrade()
+        self.total_power_usage += room.power_usage
+        self.total_storage += room.storage_capacity()
+
+    def get(self, room_type):
+        """Get the first built room of a type.
+
+        Arguments:
+        room_type -- name of room type, eg. "kitchen"
+
+        Returns:
+        room -- first Room of that type, or None
+        """
+        rooms = self.by_type.get(room_type)
+        return rooms[0] if rooms else None
+
+    def get_id(self, room_id):
+        """Get a room by its room ID.
+
+        Arguments:
+        room_id -- ID of room
+
+        Returns:
+        room -- matching Room, or None
+        """
+        return self.by_id.get(room_id)
+
+    def all_of(self, room_type):
+        """Get every built room of a type.
+
+        Arguments:
+        room_type -- name of room type
+
+        Returns:
+        list -- Rooms of that type
+        """
+        return list(self.by_type.get(room_type, []))
+
+    def invalidate_production(self):
+        """Mark production of every room as needing to be recalculated."""
+        for room in self.by_id.values():
+            room.invalidate()
+
+    def has(self, room_type):
+        """Check if a room of a type has been built.
+
+        Arguments:
+        room_type -- name of room type
+
+        Returns:
+        bool -- whether one has been built
+        """
+        return bool(self.by_type.get(room_type))
+
 
 class Room(object):
-    """Room class."""
+    """Room class.
+
+    Attributes are declared in __slots__, so Rooms carry no per-instance
+    __dict__.
+    """
+
+    __slots__ = (
+        "room_id", "name", "assigned", "level", "risk", "broken",
+        "power_available", "can_produce", "assigned_limit", "power_usage",
+        "capacity", "components", "production", "production_stale",
+        "can_rush", "rushed",
+    )
 
     def __init__(self, name, player):
         """Room class constructor.
@@ -14,8 +218,9 @@ class Room(object):
         name -- name of room
         player -- player object
         """
+        self.room_id = None
         self.name = name
-        self.assigned = ''
+        self.assigned = set()
         self.level = 1
         self.risk = False
         self.broken = False
@@ -23,6 +228,7 @@ class Room(object):
         self.can_produce = False
         self.assigned_limit = 0
         self.power_usage = 0
+        self.capacity = 0
         self.components = []
 
         room_config = {
@@ -38,7 +244,8 @@ class Room(object):
             },
             "storage": {
                 "components": ["steel", "steel"],
-                "power_usage": 1
+                "power_usage": 1,
+                "capacity": 100
             },
             "kitchen": {
                 "risk": 1,
@@ -73,15 +280,14 @@ class Room(object):
             self.components = config.get("components", [])
             self.assigned_limit = config.get("assigned_limit", 0)
             self.power_usage = config.get("power_usage", 0)
+            self.capacity = config.get("capacity", 0)
         else:
             print_line("Unknown room type. Please check the configuration.")
 
-        if self.can_produce:
-            self.production = 0
-            self.can_rush = True
-            self.rushed = False
-        else:
-            self.can_rush = False
+        self.production = 0
+        self.production_stale = self.can_produce
+        self.can_rush = self.can_produce
+        self.rushed = False
 
     def __str__(self):
         """String representation of object.
@@ -95,85 +301,89 @@ class Room(object):
         """Rush building of Room."""
         self.rushed = True
         self.risk += 5
+        self.invalidate()
         print_line(self.name, " has been rushed!")
 
     def fix(self):
         """Repair room if damaged."""
         pass
 
+    def upgrade(self):
+        """Increase level of Room."""
+        self.level += 1
+
+    def storage_capacity(self):
+        """Get weight of items Room can store.
+
+        Returns:
+        int -- storage capacity of Room
+        """
+        return self.capacity * self.level
+
+    def invalidate(self):
+        """Mark production as needing to be recalculated.
+
+        Called whenever something production depends on changes: an
+        assignment, an assigned inhabitant's SPECIAL stats, the player's
+        perks, a rush or a breakage.
+        """
+        self.production_stale = True
+
     def update_production(self, player, people):
         """Calculate production value of Room.
 
+        The value is cached until invalidate() is called.
+
         Arguments:
         player -- player object
-        people -- list of all people in the game
+        people -- Population of all people in the game
+
+        Returns:
+        int -- production value of Room, in whole units
         """
         if self.broken:
-            production = 0
             print_line(self.name, "is broken and needs to be fixed.")
+            self.production = 0
+            return self.production
+        if not self.production_stale:
+            return self.production
+
+        production = 0
+        if self.name in PRODUCTION_CONFIG:
+            config = PRODUCTION_CONFIG[self.name]
+            for person_id in self.assigned:
+                attribute_value = getattr(people.get(person_id), config["attribute"])
+                production += attribute_value * config["base_value"]
+            player_bonus = getattr(player, config["player_bonus"])
+            if player_bonus > 0:
+                production *= 1 + (player_bonus * config["bonus_multiplier"])
         else:
-            production = 0
-            production_config = {
-                "generator": {
-                    "attribute": "strength",
-                    "base_value": 10,
-                    "player_bonus": player.electrician,
-                    "bonus_multiplier": 0.05
-                },
-                "kitchen": {
-                    "attribute": "intelligence",
-                    "base_value": 10,
-                    "player_bonus": player.cooking,
-                    "bonus_multiplier": 0.05
-                },
-                "water works": {
-                    "attribute": "perception",
-                    "base_value": 10,
-                    "player_bonus": player.cooking,
-                    "bonus_multiplier": 0.05
-                },
-                "radio": {
-                    "attribute": "charisma",
-                    "base_value": 10,
-                    "player_bonus": player.inspiration,
-                    "bonus_multiplier": 0.05
-                }
-            }
+            print_line("Unknown room type for production calculation.")
 
-            if self.name in production_config:
-                config = production_config[self.name]
-                for person_index in str(self.assigned):
-                    if person_index == '1':
-                        attribute_value = getattr(people[int(person_index)], config["attribute"])
-                        production += attribute_value * config["base_value"]
-                if config["player_bonus"] > 0:
-                    production *= 1 + (config["player_bonus"] * config["bonus_multiplier"])
-            else:
-                print_line("Unknown room type for production calculation.")
-
-            if player.inspiration > 0:
-                production *= 1 + (player.inspiration * 0.03)
-            if self.can_rush and self.rushed:
-                production *= 2
+        if player.inspiration > 0:
+            production *= 1 + (player.inspiration * 0.03)
+        if self.can_rush and self.rushed:
+            production *= 2
 
+        # Perk bonuses are fractions, but rooms only ever make whole units.
+        production = int(production)
+        self.production = production
+        self.production_stale = False
         return production
 
     def count_assigned(self):
         """Count inhabitants assigned to Room."""
-        return str(self.assigned).count('1')
+        return len(self.assigned)
 
     def see_assigned(self, people):
         """Print names of inhabitants assigned to Room.
 
         Arguments:
-        people -- list of all people in the game
+        people -- Population of all people in the game
         """
-        count = 0
-        for x in str(self.assigned):
-            if x == '1':
-                person = people[count]
-                print_line("      ", person.name, person.surname)
-            count += 1
+        for person_id in sorted(self.assigned):
+            person = people.get(person_id)
+            print_line("      ", person.name, person.surname)
 
     def count_component(self, component):
         """Count components required to build Room.
@@ -186,7 +396,13 @@ class Room(object):
         """
         return self.components.count(str(component))
 
-    def use_power(self):
-        """Consume player's power."""
-        for _ in range(self.power_usage):
-            Item('watt').destroy("player")
\ No newline at end of file
+    def use_power(self, inventory):
+        """Consume player's power.
+
+        Arguments:
+        inventory -- player's Inventory
+
+        Returns:
+        int -- amount of power consumed
+        """
+        return Item('watt').destroy(inventory, self.power_usage)
@@ -0,0 +1,1276 @@
+"""Module containing the VaultSimulation engine and its command sources."""
+
+from collections import Counter, deque
+
+from Human import Player, NPC, Population
+from population_store import PopulationStore, DAILY_HUNGER, DAILY_THIRST
+from Room import Room, AssignmentIndex, RoomRegistry
+from Item import Item
+from Inventory import Inventory
+from loot import LootSampler
+from rng import RandomStreams, binomial
+from rationing import plan_rations, FOOD_RELIEF, WATER_RELIEF
+from commands import registry
+import trading
+
+import output
+from general_funcs import print_line, load_time, count_item
+
+
+class InteractiveCommands(object):
+    """Command source reading commands and answers from the keyboard."""
+
+    def next_command(self):
+        """Read the next command.
+
+        Returns:
+        str -- command typed by the player
+        """
+        return input("Choose what to do: ")
+
+    def ask(self, prompt):
+        """Ask the player a follow-up question.
+
+        Arguments:
+        prompt -- question to show
+
+        Returns:
+        str -- answer typed by the player
+        """
+        return input(prompt)
+
+
+class ScriptedCommands(object):
+    """Command source reading commands and answers from a list of lines."""
+
+    def __init__(self, lines=(), answers=None):
+        """ScriptedCommands constructor.
+
+        Arguments:
+        lines -- commands and answers, in the order they will be read
+        answers -- function giving an answer once lines run out (default: None)
+        """
+        self.lines = deque(lines)
+        self.answers = answers
+
+    def extend(self, lines):
+        """Queue more lines.
+
+        Arguments:
+        lines -- commands and answers to add
+        """
+        self.lines.extend(lines)
+
+    def next_command(self):
+        """Read the next command.
+
+        Returns:
+        str -- next line, or None if there are none left
+        """
+        if self.lines:
+            return self.lines.popleft()
+        return None
+
+    def ask(self, prompt):
+        """Answer a follow-up question with the next line.
+
+        Arguments:
+        prompt -- question being asked
+
+        Returns:
+        str -- next line
+        """
+        if self.lines:
+            return self.lines.popleft()
+        if self.answers is not None:
+            return self.answers(prompt)
+        raise EOFError(f"No scripted answer left for: {prompt}")
+
+
+class VaultSimulation(object):
+    """Vault engine holding the whole game state.
+
+    Days are advanced with step_day(). Commands and answers to follow-up
+    questions come from a command source, so the same engine runs the
+    interactive game and headless batch jobs. Output is flushed once at the
+    end of every day; headless runs pick a non-interactive sink from output.
+    A vault with a journal commits the day's changes to it as the day ends,
+    and a vault with a recorder writes down every command and answer it reads.
+    """
+
+    def __init__(self, commands=None, vectorized=False, seed=None):
+        """VaultSimulation constructor.
+
+        Arguments:
+        commands -- command source (default: None, an empty ScriptedCommands)
+        vectorized -- keep inhabitant stats in a NumPy PopulationStore and run
+                      the daily upkeep as array operations (default: False)
+        seed -- seed of the run's RandomStreams (default: None, a fresh seed)
+        """
+        self.commands = commands if commands is not None else ScriptedCommands()
+        self.source = self.commands
+        self.rng = RandomStreams(seed)
+
+        self.day_count = 1
+        self.skip = False
+        self.end = False
+        self.position = "secure"
+        self.player_quit = False
+
+        self.player = None
+        self.people = Population(PopulationStore() if vectorized else None)
+        self.scavengers = set()
+        self.used_names = []
+        self.rooms = RoomRegistry()
+        self.assignments = AssignmentIndex()
+        self.inventory = Inventory({'turret': 1})
+
+        self.all_items = [
+            "wood",
+            "steel",
+            "turret",
+            "food",
+            "water",
+            "wire",
+            "silicon",
+            "chip",
+            "watt",
+            "copper",
+            "gun"]
+        self.loot = LootSampler(self.all_items, self.rng["loot"])
+        self.trader_loot = LootSampler(self.all_items, self.rng["trader"])
+
+        self.all_rooms = [
+            "living",
+            "bath",
+            "generator",
+            "kitchen",
+            "trader",
+            "storage",
+            "water works"]
+
+        self.caps = 100
+        self.trader_caps = 400
+        self.happiness = 100
+        self.trader_inventory = Inventory()
+        self.defense = 0
+        self.action_points = 50
+        self.overuse = False
+        self.overuse_amount = 0
+        # Whether today's production, upkeep and raid roll have run, eg. when saved mid-day.
+        self.day_started = False
+        self.auto_feed = True
+        self.ration_policy = "neediest"
+        # From day 11, one day in raid_odds brings a raid; 0 turns them off.
+        self.raid_odds = 5
+        self.journal = None
+        self.recorder = None
+
+    def setup(self, player=None):
+        """Create the player, first inhabitants, starting rooms and trader stock.
+
+        Arguments:
+        player -- Player object to use instead of asking for one (default: None)
+        """
+        self.player = player if player is not None else self.create_player()
+        self.people.add(self.player)
+        load_time(100, "Creating player.")
+        self.first_few()
+        load_time(200, "Populating Vault with 5 random inhabitants")
+
+        for room in ['generator', 'living', 'kitchen', 'water works', 'trader']:
+            self.rooms.add(Room(room, self.player))
+
+        self.find_rand_item("trader", 20)
+
+    @property
+    def over(self):
+        """Whether the game has ended."""
+        return self.end or self.position != "secure" or self.player_quit
+
+    @property
+    def outcome(self):
+        """How the game has ended so far: "extinct", "died", "lost position", "quit" or "running".
+
+        "extinct" is the player dying along with everyone else.
+        """
+        if self.end:
+            return "died" if len(self.people) else "extinct"
+        if self.position != "secure":
+            return "lost position"
+        if self.player_quit:
+            return "quit"
+        return "running"
+
+    def summary(self):
+        """Get the state of the vault in a form that can be saved as JSON.
+
+        Returns:
+        dict -- day, outcome, population, resources, rooms and items
+        """
+        rooms = {}
+        for room in self.rooms:
+            rooms[room.name] = rooms.get(room.name, 0) + 1
+        return {
+            "seed": self.rng.seed,
+            "day": self.day_count,
+            "outcome": self.outcome,
+            "population": len(self.people),
+            "player_level": self.player.level if self.player is not None else 0,
+            "caps": self.caps,
+            "happiness": self.happiness,
+            "avg_hunger": self.avg_hunger(),
+            "avg_thirst": self.avg_thirst(),
+            "rooms": rooms,
+            "items": dict(sorted(self.inventory.items())),
+        }
+
+    def ask(self, prompt):
+        """Ask a follow-up question through the current command source.
+
+        Arguments:
+        prompt -- question to ask
+
+        Returns:
+        str -- answer
+        """
+        answer = self.source.ask(prompt)
+        if self.recorder is not None:
+            self.recorder.answer(self.day_count, answer)
+        return answer
+
+    def step_day(self, commands=None):
+        """Advance the vault by one day.
+
+        Arguments:
+        commands -- commands and answers for this day (default: None, read
+                    from the command source)
+
+        Returns:
+        bool -- whether the game is still going
+        """
+        self.source = self.commands if commands is None else ScriptedCommands(commands)
+
+        if self.day_started:
+            print_line(f"Carrying on with day {self.day_count}")
+        else:
+            self.action_points = 50
+            if self.overuse:
+                self.action_points = 50 - self.overuse_amount
+            load_time(300, "A new day dawns.")
+            print_line(f"Today is day {self.day_count}")
+
+            self.daily_production()
+            self.daily_upkeep()
+
+            raid_chance = self.rng["raid"].randint(1, self.raid_odds) if self.raid_odds > 0 else 0
+            if self.day_count == 5 or (self.day_count >= 11 and raid_chance == self.raid_odds):
+                self.raid()
+            self.day_started = True
+
+        while self.action_points > 0 and not self.overuse and not self.over:
+            a = self.source.next_command()
+            if a is None:
+                break
+            if self.recorder is not None:
+                self.recorder.command(self.day_count, a)
+            self.choice(a)
+            if self.skip:
+                break
+        self.skip = False
+
+        print_line(f"Due to your shelter's happiness level, you have gained {self.happiness // 10} experience")
+        self.player.gain_xp(self.happiness // 10)
+        if self.happiness < 5:
+            self.position = "lost"
+        elif self.happiness < 25:
+            print_line("Warning. Your people are unhappy. You could lose your position if you don't improve the situation soon.")
+        self.happiness_loss()
+
+        if self.recorder is not None:
+            self.recorder.end_day(self.day_count)
+        self.day_started = False
+        self.day_count += 1
+        if self.journal is not None:
+            self.journal.commit(self)
+        output.flush()
+        return not self.over
+
+    def daily_production(self):
+        """Feed inhabitants, restock the trader and run production rooms."""
+        if self.auto_feed:
+            self.auto_feed_all()
+
+        number = self.rng["trader"].randint(0, len(self.trader_inventory) // 5)
+        self.lose_items("trader", number)
+        number = self.rng["trader"].randint(0, len(self.trader_inventory) // 5)
+        self.find_rand_item("trader", number)
+
+        generator = self.rooms.get('generator')
+        generator.update_production(self.player, self.people)
+        print_line(f"Producing {generator.production} power")
+        self.add_to_inven("watt", generator.production, "player")
+        self.see_resources()
+
+        for r in self.rooms:
+            if r.name != 'generator' and r.can_produce:
+                if self.can_use_power(r):
+                    r.use_power(self.inventory)
+                    r.update_production(self.player, self.people)
+                    if r.name == "kitchen":
+                        self.add_to_inven("food", r.production, 'player')
+                        print_line(f"Cooking {r.production} food.")
+                    elif r.name == "water works":
+                        self.add_to_inven("water", r.production, 'player')
+                        print_line(f"Pumping {r.production} water.")
+                else:
+                    print_line(f"You don't have enough power to keep the {r.name} supplied.")
+                if r.can_rush and r.rushed:
+                    r.rushed = False
+                    r.invalidate()
+
+    def daily_upkeep(self):
+        """Make inhabitants hungrier and thirstier, and handle scavengers."""
+        if self.people.store is not None:
+            self.daily_upkeep_vectorized()
+            return
+        for person in list(self.people):
+            person.hunger += DAILY_HUNGER
+            if person.hunger > 99:
+                print_line(f"{person.name} {person.surname} has died of hunger")
+                self.death(person)
+                continue
+            elif person.hunger > 80:
+                print_line(f"Warning! {person.name} {person.surname} is starving and may die soon.")
+            elif person.hunger > 50:
+                print_line(f"{person.name} {person.surname} is hungry.")
+            person.thirst += DAILY_THIRST
+            if person.thirst > 99:
+                print_line(f"{person.name} {person.surname} has died of thirst")
+                self.death(person)
+                continue
+            elif person.thirst > 80:
+                print_line(f"Warning! {person.name} {person.surname} is extremely thirsty and may die soon.")
+            elif person.thirst > 50:
+                print_line(f"{person.name} {person.surname} is thirsty.")
+            self.check_xp(person.name, person.surname)
+            if person is not self.player:
+                if person.scavenging:
+                    self.scavenge_day(person)
+                    if person not in self.people:
+                        continue
+                r = self.assignments.room(person)
+                if r is not None:
+                    if r.can_produce:
+                        person.gain_xp(r.production // 10)
+
+    def daily_upkeep_vectorized(self):
+        """Run daily_upkeep as array operations on the population store.
+
+        Warnings are reported as one line per kind instead of one per person.
+        """
+        report = self.people.store.tick()
+        if report["died_of_hunger"]:
+            self.deaths(report["died_of_hunger"], "hunger")
+        if report["died_of_thirst"]:
+            self.deaths(report["died_of_thirst"], "thirst")
+        if report["starving"]:
+            print_line(f"Warning! {report['starving']} inhabitants are starving and may die soon.")
+        if report["hungry"]:
+            print_line(f"{report['hungry']} inhabitants are hungry.")
+        if report["parched"]:
+            print_line(f"Warning! {report['parched']} inhabitants are extremely thirsty and may die soon.")
+        if report["thirsty"]:
+            print_line(f"{report['thirsty']} inhabitants are thirsty.")
+        for person in report["levelled"]:
+            self.check_xp(person.name, person.surname)
+        for person_id in sorted(self.scavengers):
+            self.scavenge_day(self.people.get(person_id))
+        for r in self.rooms:
+            if r.can_produce:
+                for person_id in list(r.assigned):
+                    person = self.people.get(person_id)
+                    if person is not self.player:
+                        person.gain_xp(r.production // 10)
+
+    def scavenge_day(self, person):
+        """Run one day of an inhabitant's scavenging mission.
+
+        Arguments:
+        person -- NPC out scavenging
+        """
+        if person.days_to_scavenge_for == person.days_scavenging:
+            self.stop_scavenging(person)
+        else:
+            person.days_scavenging += 1
+            self.rand_item("player")
+            health_loss = self.rng["scavenging"].randint(0, 50)
+            self.take_damage(person, health_loss)
+            if person not in self.people:
+                return
+            person.gain_xp(self.rng["scavenging"].randint(10, 200))
+        if person.HP < 20:
+            self.stop_scavenging(person)
+
+    def stop_scavenging(self, person):
+        """Bring an inhabitant back from scavenging.
+
+        Arguments:
+        person -- NPC out scavenging
+        """
+        person.scavenging = False
+        person.days_to_scavenge_for = 0
+        person.days_scavenging = 0
+        self.scavengers.discard(person.person_id)
+
+    def see_people(self):
+        """Display info of all inhabitants."""
+        for person in self.people:
+            print_line(person.name, person.surname)
+            print_line(
+                "    Age:" + str(person.age),
+                " Gender:" + person.gender.upper(),
+                " Hunger:" + str(person.hunger),
+                " Thirst:" + str(person.thirst),
+                "   Room:" + person.assigned_room)
+
+    def see_inventory(self, inven):
+        """Display all items in inventory.
+
+        Arguments:
+        inven -- inventory to show, 'player' or 'trader'
+        """
+        inven = str(inven)
+        if inven == "player":
+            target = self.inventory
+        elif inven == "trader":
+            target = self.trader_inventory
+        else:
+            print_line("Bug with inventory system. Please contact dev!")
+            return
+        for x, count in target.items():
+            it = Item(x)
+            print_line(
+                f"{x}*{count}",
+                f"| Weight: {it.weight}",
+                f"| Value: {it.value}",
+                f"| Components: {', '.join(it.components)}",
+                f"| Rarity: {it.rarity}")
+
+    def storage_capacity(self):
+        """Calculate max inventory capacity of player.
+
+        Returns:
+        capacity -- max inventory capacity of player
+        """
+        return self.rooms.total_storage
+
+    def living_capacity(self):
+        """Get maximum inhabitant capacity of shelter.
+
+        Returns:
+        int -- maximum capacity of shelter
+        """
+        room = self.rooms.get('living')
+        print_line(f"Maximum number of inhabitants: {5 * room.level}")
+        return 5 * room.level
+
+    def see_resources(self):
+        """Print food, water, and power Player has available."""
+        print_line(f"Food: {self.count_item('food', 'player')}")
+        print_line(f"Water: {self.count_item('water', 'player')}")
+        print_line(f"Power: {self.count_item('watt', 'player')}")
+
+    def count_item(self, item, target_inventory):
+        """Count total number of specified item in inventory.
+
+        Arguments:
+        item -- item to count
+        target_inventory -- inventory to count in, 'player' or 'trader'
+
+        Returns:
+        int -- count of item in inventory
+        """
+        return count_item(item, target_inventory, self.inventory, self.trader_inventory)
+
+    def find_by_first_name(self, first_name):
+        """Get the first inhabitant with a given first name.
+
+        Arguments:
+        first_name -- first name of inhabitant to search for
+
+        Returns:
+        person -- matching inhabitant, or None
+        """
+        return next((person for person in self.people if person.name == first_name.capitalize()), None)
+
+    def scavenge(self, first_name, surname, days=0):
+        """Send inhabitant on scavenging mission.
+
+        Arguments:
+        first_name -- first name of inhabitant to send
+        surname -- surname of inhabitant to send
+        days -- number of days to scavenge (default: 0)
+        """
+        person = self.people.find(first_name, surname)
+        if person is None:
+            print_line("Error with scavenging system. Please contact dev!")
+        else:
+            person.scavenging = True
+            self.scavengers.add(person.person_id)
+            if not isinstance(days, int) or days <= 0:
+                person.days_to_scavenge_for = 100
+            else:
+                person.days_to_scavenge_for = days
+        self.use_points(10)
+
+    def build(self, r):
+        """Build room specified.
+
+        Arguments:
+        r -- name of room to build
+        """
+        built_room = Room(str(r), self.player)
+        self.rooms.add(built_room)
+        load_time(5, f"Building {r}")
+        for y in set(built_room.components):
+            Item(y).destroy(self.inventory, built_room.count_component(y))
+        self.player.gain_xp(100)
+        self.use_points(10)
+
+    def craft(self, x, number=1):
+        """Craft units of specified item.
+
+        Arguments:
+        x -- item to craft
+        number -- units to craft (default: 1)
+
+        Returns:
+        bool -- whether the items were crafted
+        """
+        if not self.inventory.exchange({x: number}, self.used_components(x, number)):
+            return False
+        load_time(5, f"Crafting {x}")
+        self.player.gain_xp(Item(x).rarity * 10 * number)
+        self.use_points(min(5 * number, 50))
+        return True
+
+    def craft_plan(self, plan):
+        """Carry out a crafting plan as one inventory change.
+
+        The plan costs the action points of its crafts, at most a full day's.
+
+        Arguments:
+        plan -- CraftPlan from crafting.planner
+
+        Returns:
+        bool -- whether the plan was carried out
+        """
+        if not plan.possible:
+            return False
+        crafted = Counter()
+        spent = Counter()
+        for item, units in plan.crafts:
+            crafted[item] += units
+            spent.update(self.used_components(item, units))
+        if not self.inventory.exchange(crafted, spent):
+            return False
+        load_time(5, f"Crafting {plan.number} {plan.target}")
+        self.player.gain_xp(sum(Item(item).rarity * 10 * units for item, units in plan.crafts))
+        self.use_points(min(5 * plan.craft_count, 50))
+        return True
+
+    def used_components(self, x, number):
+        """Roll which components crafting units of an item uses up.
+
+        Every component unit is saved when randint(0, 101) rolls no higher
+        than twice the player's crafting perk. The rolls of all units of a
+        component are made as one binomial draw.
+
+        Arguments:
+        x -- item being crafted
+        number -- units being crafted
+
+        Returns:
+        Counter -- units of each component used up
+        """
+        chance = self.player.crafting * 2
+        used = min(max(101 - chance, 0), 102) / 102
+        return Counter({component: binomial(self.rng["crafting"], per * number, used)
+                        for component, per in Counter(Item(x).components).items()})
+
+    def create_player(self):
+        """Create player inhabitant.
+
+        Returns:
+        Player -- player object
+        """
+        while True:
+            name = self.ask("Choose a first name for yourself: ")
+            if len(name) <= 0:
+                print_line("You need a name!")
+            elif len(name.split()) != 1:
+                print_line("Only single word inputs are accepted.")
+            else:
+                name = name.capitalize()
+                break
+        while True:
+            parent_1 = self.ask("What is the surname of your father? ")
+            if len(parent_1) <= 0:
+                print_line("Your father needs a surname!")
+            elif len(parent_1.split()) != 1:
+                print_line("Only single word inputs are accepted.")
+            else:
+                parent_1 = parent_1.capitalize()
+                break
+        while True:
+            parent_2 = self.ask("What is the surname of your mother? ")
+            if len(parent_2) <= 0:
+                print_line("Your mother needs a surname!")
+            elif len(parent_2.split()) != 1:
+                print_line("Only single word inputs are accepted.")
+            else:
+                parent_2 = parent_2.capitalize()
+                break
+        while True:
+            gender = self.ask("What is your gender? (m/f) ")
+            if len(gender) == 0:
+                print_line("You need a gender.")
+            elif gender.lower() not in ["m", "f"]:
+                print_line("Invalid input. Only accepts 'm' or 'f'.")
+            else:
+                gender = gender.lower()
+                break
+
+        return Player(name, self.day_count, parent_1, parent_2, 21, gender)
+
+    def get_gender(self):
+        """Randomly generate gender for NPC.
+
+        Returns:
+        char -- 'm' or 'f'
+        """
+        return "m" if self.rng["births"].randint(0, 1) == 0 else "f"
+
+    def check_person(self, first_name, surname):
+        """Check if inhabitant exists in list of all inhabitants.
+
+        Arguments:
+        first_name -- first name of inhabitant to check
+        surname -- surname of inhabitant to check
+
+        Returns:
+        bool -- whether inhabitant exists or not
+        """
+        return self.people.find(first_name, surname) is not None
+
+    def gain_xp(self, first_name, last_name, amount):
+        """Add experience to Human.
+
+        Arguments:
+        first_name -- first name of Human
+        last_name -- last name of Human
+        amount -- amount of experience to add
+        """
+        person = self.people.find(first_name, last_name)
+        person.XP += amount
+
+    def check_xp(self, first_name, surname):
+        """Check experience of inhabitant.
+
+        Arguments:
+        first_name -- first name of inhabitant to check
+        surname -- surname of inhabitant to check
+        """
+        person = self.people.find(first_name, surname)
+        xp_needed = 1000 + (3 ** person.level)
+        if person.XP >= xp_needed:
+            print_line(f"{person.name} has {person.XP} XP")
+            print_line(f"{person.name} has leveled up")
+            self.level_up(person)
+            print_line(f"{person.name} is now level {person.level}")
+
+    def level_up(self, person):
+        """Level up Human and ask player for input on what stat to level up.
+
+        Arguments:
+        person -- Person object at level x
+        """
+        self.see_stats(person)
+        person.level += 1
+        if person is self.player:
+            print_line("\n")
+            while True:
+                choice = self.ask("Please choose an attribute to level up: ").lower()
+                if choice in ["strength", "perception", "endurance", "charisma", "intelligence", "luck",
+                              "medic", "crafting", "tactician", "cooking", "inspiration", "scrapper",
+                              "barter", "electrician"]:
+                    setattr(person, choice, getattr(person, choice) + 1)
+                    break
+                print_line("Invalid choice")
+            # Player perks boost every room.
+            self.rooms.invalidate_production()
+        else:
+            # Automatically level up NPCs based on a predefined logic
+            # (You can customize this based on your game's requirements)
+            person.strength += 1
+            person.perception += 1
+            person.endurance += 1
+            person.charisma += 1
+            person.intelligence += 1
+            person.luck += 1
+            room = self.assignments.room(person)
+            if room is not None:
+                room.invalidate()
+
+    def create_NPC(self, parent_1, parent_2):
+        """
+        Create new child inhabitant.
+
+        Arguments:
+            parent_1 -- parent of new child
+            parent_2 -- parent of new child
+
+        Returns:
+            person -- New NPC
+        """
+        while True:
+            name = self.ask("Choose a first name for the new child: ")
+            if len(name.split()) == 1:  # Player can only input one word
+                if name not in self.used_names:
+                    name = name.capitalize()
+                    if parent_2.gender == "m":
+                        parent_1, parent_2 = parent_2, parent_1
+                    if len(self.people) < 5 and self.day_count < 3:
+                        age = 21
+                    else:
+                        age = 0
+                    person = NPC(name, self.day_count, parent_1.surname, parent_2.surname, age, self.get_gender())
+                    self.people.add(person)
+                    parent_1.children.append(f"{name} {parent_1.surname}")
+                    parent_2.children.append(f"{name} {parent_1.surname}")
+                    parent_1.partner = f"{parent_2.name} {parent_2.surname}"
+                    parent_2.partner = f"{parent_1.name} {parent_1.surname}"
+                    self.see_people()
+                    if self.day_count > 2:  # First few births cost no points
+                        self.use_points(50)
+                    self.player.gain_xp(100)
+                    self.use_points(25)
+                    self.used_names.append(name)
+                    load_time(5, f"{name} is being born!")
+                    return person
+                else:
+                    print_line("Someone already has that name.")
+            else:
+                print_line("You have to input a single word!")
+
+    def death(self, person):
+        """Kill inhabitant.
+
+        Arguments:
+        person -- Person who's dying
+        """
+        self.deaths([person])
+
+    def deaths(self, people, cause=None):
+        """Kill several inhabitants at once.
+
+        Arguments:
+        people -- People who are dying
+        cause -- what they died of, to report first (default: None)
+        """
+        for person in people:
+            if cause is not None:
+                print_line(f"{person.name} {person.surname} has died of {cause}")
+            print_line(f"{person.name} {person.surname} has died!")
+            if isinstance(person, Player):  # If player has died.
+                self.end = True
+            self.assignments.unassign(person)
+            self.scavengers.discard(person.person_id)
+        self.people.remove_many(people)
+
+    def mature(self, person):
+        """Increment Human's age.
+
+        Arguments:
+        person -- Human who's aging
+
+        Returns:
+        person -- Human with one more year
+        """
+        person.age += 1
+        print_line(f"{person.name} has matured and is now {person.age} years old!")
+        return person
+
+    def take_damage(self, person, amount):
+        """Take health from Human.
+
+        Arguments:
+        person -- Human who's taking damage
+        amount -- amount of health to take
+
+        Returns:
+        person -- Human who has taken damage
+        """
+        person = self.people.find(person.name, person.surname)
+
+        person.defense = person.strength * 10
+        damage_taken = amount - person.defense
+        if damage_taken < 1:
+            damage_taken = 0
+        else:
+            person.HP -= damage_taken
+            if person.HP < 1:
+                self.death(person)
+
+        return person
+
+    def first_few(self):
+        """Create first few inhabitants with random names."""
+        names = [
+            "Thompson",
+            "Elenor",
+            "Codsworth",
+            "Sharmak",
+            "Luthor",
+            "Marshall",
+            "Cole",
+            "Diven",
+            "Davenport",
+            "John",
+            "Max",
+            "Lex",
+            "Leth",
+            "Exavor"]
+        for person in self.people:
+            self.used_names.append(person.name)
+            self.used_names.append(person.surname)
+        while len(self.people) < 5:
+            num_1 = self.rng["births"].randint(0, len(names) - 1)
+            num_2 = self.rng["births"].randint(0, len(names) - 1)
+            if num_1 == num_2 or names[num_1] in self.used_names or names[num_2] in self.used_names:
+                continue
+            self.people.add(NPC(names[num_1], self.day_count, names[num_2], "Alena", 21, self.get_gender()))
+            self.used_names.append(names[num_1])
+            self.used_names.append(names[num_2])
+
+    def see_stats(self, person):
+        """Check stats of inhabitant.
+
+        Arguments:
+        person - Person whose stats are being viewed
+        """
+        print_line(f"Strength: {person.strength}")
+        print_line(f"Perception: {person.perception}")
+        print_line(f"Endurance: {person.endurance}")
+        print_line(f"Charisma: {person.charisma}")
+        print_line(f"Intelligence: {person.intelligence}")
+        print_line(f"Luck: {person.luck}")
+        if person is self.player:  # Player has extra stats
+            print_line("")
+            print_line(f"Medic: {person.medic}")
+            print_line(f"Crafting: {person.crafting}")
+            print_line(f"Tactician: {person.tactician}")
+            print_line(f"Cooking: {person.cooking}")
+            print_line(f"Inspiration: {person.inspiration}")
+            print_line(f"Scrapping: {person.scrapper}")
+            print_line(f"Bartering: {person.barter}")
+            print_line(f"Electrician: {person.electrician}")
+
+    def auto_assign(self):
+        """Automatically assign inhabitants to rooms."""
+        for person in self.people:
+            if person.assigned_room == "":
+                for r in self.rooms:
+                    if r.count_assigned() < r.assigned_limit:
+                        person.assign_to_room(r, self.assignments)
+                        break
+
+    def check_room(self, room):
+        """Check if room exists.
+
+        Arguments:
+        room -- room to check for
+
+        Returns:
+        bool -- whether room exists or not
+        """
+        return room in self.all_rooms
+
+    def check_built_room(self, room):
+        """Check if room has been built yet.
+
+        Arguments:
+        room -- room to check for
+
+        Returns:
+        bool -- whether room has been built or not
+        """
+        return self.rooms.has(room)
+
+    def see_rooms(self):
+        """Print each room and details."""
+        print_line("")
+        for r in self.rooms:
+            print_line(" ".join(word.capitalize() for word in r.name.split()))
+            if r.can_produce:
+                r.update_production(self.player, self.people)
+                print_line(
+                    f"\n    Risk: {r.risk * 10}%",
+                    f"    Level: {r.level}",
+                    f"    Power: {r.power_available}",
+                    f"    Production: {r.production}")
+            else:
+                print_line(
+                    f"\n    Risk: {r.risk}%",
+                    f"    Level: {r.level}",
+                    f"    Power: {r.power_available}")
+
+            if r.can_produce or r.name == "trader":
+                r.see_assigned(self.people)
+
+    def can_use_power(self, room):
+        """
+        Determine whether the room may use power or not.
+
+        Arguments:
+        room -- the room to check power usage for
+
+        Returns:
+        bool -- whether room may use power
+        """
+        return self.count_item('watt', 'player') > room.power_usage
+
+    def power_usage(self):
+        """Check total power needed.
+
+        Returns:
+        total -- total power needed by all rooms
+        """
+        return self.rooms.total_power_usage
+
+    def power_production(self):
+        """Check total power being produced.
+
+        Returns:
+        production -- total amount of power being produced
+        """
+        generator = self.rooms.get('generator')
+        return generator.production
+
+    def rand_item(self, target_inventory):
+        """Put a random item in inventory.
+
+        Arguments:
+        target_inventory -- inventory to put item in
+        """
+        sampler = self.trader_loot if target_inventory == "trader" else self.loot
+        actual_item = sampler.sample()
+        if actual_item is not None:
+            if target_inventory == "player":
+                self.add_to_inven(actual_item, 1, 'player')
+            elif target_inventory == "trader":
+                self.add_to_inven(actual_item, 1, 'trader')
+            else:
+                print_line("Bug with random item system. Please contact dev!")
+
+    def count_weight(self):
+        """Calculate weight of all items in inventory.
+
+        Returns:
+        weight -- weight of all items in inventory
+        """
+        return self.inventory.total_weight()
+
+    def find_rand_item(self, inven, items):
+        """Find random items and add them to inventory.
+
+        Arguments:
+        inven -- inventory to add items to
+        items -- how many items to add
+        """
+        if inven == "player":
+            self.loot.sample_many(items, self.inventory)
+        elif inven == "trader":
+            self.trader_loot.sample_many(items, self.trader_inventory)
+        else:
+            print_line("Bug with random item system. Please contact dev!")
+
+    def add_to_inven(self, x, number, inven):
+        """Add given item to inventory.
+
+        Arguments:
+        x -- item to add to inventory
+        number -- amount of item to add to inventory
+        inven -- inventory to add item to
+        """
+        x = str(x)
+        inven = str(inven)
+        if x not in self.all_items:
+            print_line(
+                "Item doesn't exist in the game's databases. ",
+                "Major bug with inventory adding system. Please contact dev.")
+        else:
+            if inven == "player":
+                self.inventory.add(x, number)
+            elif inven == "trader":
+                self.trader_inventory.add(x, number)
+
+    def lose_items(self, inven, number):
+        """Randomly delete multiple items from inventory.
+
+        Arguments:
+        inven -- inventory to delete items from
+        number -- amount of items to delete
+        """
+        if inven == "trader":
+            for _ in range(number):
+                if self.trader_inventory:
+                    self.trader_inventory.pop_random(self.rng["trader"])
+        elif inven == "player":
+            print_line("The raid made off with these items!")
+            for _ in range(number):
+                if self.inventory:
+                    item = self.inventory.pop_random(self.rng["raid"])
+                    print_line(item)
+        else:
+            print_line("Major bug in item losing system. Please contact dev!")
+
+    def scrap(self, it, number=1):
+        """Scrap units of an item and receive their components.
+
+        Arguments:
+        it -- item to scrap
+        number -- units to scrap (default: 1)
+        """
+        if it not in self.all_items:
+            print_line(
+                "Bug with item scrapping system.",
+                "Invalid argument passed to function. Please contact dev.")
+        elif Item(it).scrap(self.inventory, self.player, self.rng["crafting"], number):
+            load_time(300, f"Scrapping {it}")
+            self.player.gain_xp(Item(it).rarity * 10 * number)
+        self.use_points(min(2 * number, 50))
+
+    def raid(self):
+        """Force raid on shelter."""
+        self.update_defense()
+        raiders = ["Super Mutant", "Raider", "Synth", "Feral Ghoul"]
+        raider = raiders[self.rng["raid"].randint(0, len(raiders) - 1)]
+        increasing_attack = self.day_count // 5
+        attack_power = self.rng["raid"].randint(1, increasing_attack)
+        load_time(10, f"There was a {raider} raid on your shelter!")
+        print_line(f"The total enemy power was {attack_power}")
+        print_line(f"Your total defenses are {self.defense}")
+        if self.defense > attack_power:
+            print_line("Your defenses were strong enough to send them packing!")
+        else:
+            loss = int(attack_power - self.defense)
+            self.lose_items("player", loss)
+            if loss > 10:
+                death_chance = loss // 10
+                dice = self.rng["raid"].randint(2, 25)
+                if death_chance < dice:
+                    possible_deaths = self.people[1:]
+                    if possible_deaths:
+                        victim = possible_deaths[self.rng["raid"].randint(0, len(possible_deaths) - 1)]
+                        print_line(f"{victim.name} {victim.surname} has been killed in a raid")
+                        self.death(victim)
+        for person in self.people:
+            person.gain_xp(attack_power * 10)
+        self.use_points(30)
+
+    def update_defense(self):
+        """Update defense of shelter based on guns and turrets in inventory."""
+        self.defense = 0
+        turret_count = self.count_item("turret", "player")
+        self.defense += 10 * turret_count
+        gun_count = self.count_item("gun", "player")
+        self.defense += gun_count
+        strength_sum = self.total("strength")
+        self.defense += strength_sum
+        if self.player.tactician > 0:
+            self.defense *= 1 + (self.player.tactician * 0.05)
+        if self.player.inspiration > 0:
+            self.defense *= 1 + (self.player.inspiration * 0.03)
+
+    def total(self, stat):
+        """Sum a stat over all inhabitants.
+
+        Arguments:
+        stat -- name of stat, eg. "hunger"
+
+        Returns:
+        total -- sum of stat
+        """
+        if self.people.store is not None:
+            return self.people.store.total(stat)
+        return sum(getattr(person, stat) for person in self.people)
+
+    def avg_hunger(self):
+        """Calculate average hunger level of all inhabitants.
+
+        Returns:
+        avg -- average hunger level, 0 once nobody is left
+        """
+        if not len(self.people):
+            return 0
+        total = self.total("hunger")
+        avg = total // len(self.people)
+        return avg
+
+    def avg_thirst(self):
+        """Calculate average thirst level of all inhabitants.
+
+        Returns:
+        avg -- average thirst level, 0 once nobody is left
+        """
+        if not len(self.people):
+            return 0
+        total = self.total("thirst")
+        avg = total // len(self.people)
+        return avg
+
+    def feed(self, first_name, surname, amount):
+        """Reduce hunger level of inhabitant.
+
+        Arguments:
+        first_name -- first name of inhabitant to feed
+        surname -- surname of inhabitant to feed
+        amount -- units of food to give
+
+        Returns:
+        int -- units of food actually given
+        """
+        person = self.people.find(first_name, surname)
+        given = Item('food').destroy(self.inventory, amount)
+        person.hunger -= given * FOOD_RELIEF
+        if person.hunger < 0:
+            person.hunger = 0
+        return given
+
+    def drink(self, first_name, surname, amount):
+        """Reduce thirst level of inhabitant.
+
+        Arguments:
+        first_name -- first name of inhabitant to feed
+        surname -- surname of inhabitant to feed
+        amount -- units of water to give
+
+        Returns:
+        int -- units of water actually given
+        """
+        person = self.people.find(first_name, surname)
+        given = Item('water').destroy(self.inventory, amount)
+        person.thirst -= given * WATER_RELIEF
+        if person.thirst < 0:
+            person.thirst = 0
+        return given
+
+    def workers(self):
+        """Get person IDs of everyone assigned to a room or out scavenging.
+
+        Returns:
+        set -- person IDs of workers
+        """
+        return set(self.assignments.room_of) | self.scavengers
+
+    def auto_feed_all(self):
+        """Automatically feed all inhabitants.
+
+        Food and water are shared out by the ration policy in one pass and
+        taken from the inventory in one go.
+        """
+        load_time(200, "Feeding all inhabitants.")
+        plan = plan_rations(self.people, self.count_item("food", "player"),
+                            self.count_item("water", "player"), self.ration_policy, self.workers())
+        plan.apply(self.inventory)
+        if plan.food_total or plan.water_total:
+            print_line(f"Handed out {plan.food_total} food and {plan.water_total} water.")
+
+    def happiness_loss(self):
+        """Decrease overall happiness level based on overall hunger and thirst."""
+        loss = 0
+        for y in range(30, 101, 10):
+            if self.avg_hunger() < y:
+                loss += y - 30
+                break
+        for y in range(30, 101, 10):
+            if self.avg_thirst() < y:
+                loss += y - 30
+                break
+        if loss > 0:
+            self.happiness -= loss
+            print_line(
+                f"Due to your inhabitants being hungry and/or thirsty, the "
+                f"shelter's overall happiness has dropped to {self.happiness}")
+
+    def use_points(self, point):
+        """Remove action points from total.
+
+        Arguments:
+        point -- how many points to remove
+        """
+        if point > 50:
+            print_line(
+                "Bug with point usage system. ",
+                "It's trying to use more than 50, " +
+                "please note this and contact dev.")
+        else:
+            usage = self.action_points - point
+            self.overuse = False
+            if usage < 0:
+                self.overuse_amount = abs(usage)
+                self.overuse = True
+            else:
+                self.action_points = usage
+
+    def trade(self):
+        """Trading system."""
+        load_time(100, "Initializing trading system.")
+        stop_trade = False
+        while not stop_trade:
+            print_line("")
+            print_line("Here are the traders' items: ")
+            self.see_inventory("trader")
+            print_line(f"\nThe trader has {self.trader_caps} caps.")
+
+            print_line("\nHere are your items: ")
+            self.see_inventory("player")
+            print_line(f"\nYou have {self.caps} caps.")
+
+            print_line(
+                "\nFor instance, input (buy 5 food) if you want to buy 5 " +
+                "units of food, or (buy 5 food, sell 3 gun) to make several " +
+                "trades at once. Or input (end) to stop trading.")
+            a = self.ask("What trade would you like to make? ")
+            if a.split()[:1] in (["end"], ["stop"]):
+                stop_trade = True
+                continue
+            try:
+                self.report_trade(trading.settle(self, a))
+            except trading.TradeError as error:
+                print_line(str(error))
+        load_time(100, "Ending trade")
+
+    def report_trade(self, settlement):
+        """Show what a settled trade moved.
+
+        Arguments:
+        settlement -- Settlement from trading.settle()
+        """
+        for line, price in settlement.lines:
+            verb = "Bought" if line.action == "buy" else "Sold"
+            print_line(f"{verb} {line.amount} {line.item} at {price} caps each")
+        if settlement.caps < 0:
+            print_line(f"You paid {-settlement.caps} caps.")
+        else:
+            print_line(f"You received {settlement.caps} caps.")
+
+    def choice(self, a):
+        """Choice/Command input system.
+
+        Arguments:
+        a -- command to run
+        """
+        registry.dispatch(self, a)
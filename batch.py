@@ -0,0 +1,295 @@
+"""Run a grid of vault scenarios headlessly, in parallel.
+
+A scenario sets the starting caps, the raid odds, the rush strategy and the
+feeding policy of a vault. Every scenario is run once per seed in a
+ProcessPoolExecutor worker, each vault playing a fixed daily plan with its
+output thrown away. Results stream back as vaults finish and are then
+aggregated into one table, one row per scenario:
+
+    python batch.py --caps 100 500 --raid-odds 3 5 --rush never safe \\
+        --feeding neediest off --seeds 20 --days 200 --csv sweep.csv
+
+Runs share nothing, so the sweep scales with the number of worker processes.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Human import Player
+from rationing import POLICIES
+from Simulation import VaultSimulation, ScriptedCommands
+import output
+
+# Scenario settings and their defaults.
+DEFAULTS = {
+    "caps": 100,
+    "raid_odds": 5,
+    "rush": "never",
+    "feeding": "neediest",
+}
+
+# Feeding policies: a rationing policy, or "off" to turn auto feeding off.
+FEEDING = tuple(POLICIES) + ("off",)
+
+# Most a room can risk breaking, out of 10, before the "safe" strategy stops rushing it.
+SAFE_RISK = 3
+
+
+def rush_never(vault):
+    """Rush strategy that never rushes."""
+    return []
+
+
+def rush_safe(vault):
+    """Rush strategy that rushes rooms while they are unlikely to break."""
+    return [f"rush {room.name}" for room in first_of_each(vault)
+            if room.can_rush and not room.rushed and not room.broken and room.risk < SAFE_RISK]
+
+
+def rush_always(vault):
+    """Rush strategy that rushes every room it can, every day."""
+    return [f"rush {room.name}" for room in first_of_each(vault)
+            if room.can_rush and not room.rushed and not room.broken]
+
+
+RUSH_STRATEGIES = {
+    "never": rush_never,
+    "safe": rush_safe,
+    "always": rush_always,
+}
+
+
+def first_of_each(vault):
+    """Get the first built room of each type, the one commands act on.
+
+    Arguments:
+    vault -- VaultSimulation to look in
+
+    Returns:
+    list -- Rooms
+    """
+    return [rooms[0] for rooms in vault.rooms.by_type.values() if rooms]
+
+
+def scenario_grid(**values):
+    """Build every combination of scenario settings.
+
+    Arguments:
+    **values -- list of values per setting; settings left out keep their default
+
+    Returns:
+    list -- scenario dicts
+    """
+    settings = {name: values.get(name) or [default] for name, default in DEFAULTS.items()}
+    return [dict(zip(settings, combination)) for combination in itertools.product(*settings.values())]
+
+
+def answer(prompt):
+    """Answer the follow-up questions of a batch vault.
+
+    Arguments:
+    prompt -- question being asked
+
+    Returns:
+    str -- "y" to confirmations, an attribute to level up otherwise
+    """
+    if prompt.startswith("Are you sure"):
+        return "y"
+    return "strength"
+
+
+def simulate(scenario, seed, days):
+    """Run one vault of a scenario headlessly. Runs in a worker process.
+
+    Arguments:
+    scenario -- dict of scenario settings
+    seed -- seed of the vault
+    days -- most days to run for
+
+    Returns:
+    dict -- scenario, seed, survival day, outcome, population and
+            happiness curves, final caps and inventory value
+    """
+    output.set_sink(output.NullSink())
+    commands = ScriptedCommands(answers=answer)
+    vault = VaultSimulation(commands, seed=seed)
+    vault.setup(Player("Overseer", 1, "Vault", "Tec", 21, "m"))
+    vault.caps = scenario["caps"]
+    vault.raid_odds = scenario["raid_odds"]
+    if scenario["feeding"] == "off":
+        vault.auto_feed = False
+    else:
+        vault.ration_policy = scenario["feeding"]
+    rush = RUSH_STRATEGIES[scenario["rush"]]
+
+    population = []
+    happiness = []
+    start = time.perf_counter()
+    while vault.day_count <= days:
+        commands.extend(["auto assign"] + rush(vault) + ["skip"])
+        going = vault.step_day()
+        population.append(len(vault.people))
+        happiness.append(vault.happiness)
+        if not going:
+            break
+
+    return {
+        "scenario": scenario,
+        "seed": seed,
+        "survival_day": vault.day_count - 1,
+        "outcome": vault.outcome,
+        "population": population,
+        "happiness": happiness,
+        "caps": vault.caps,
+        "inventory_value": vault.inventory.value,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def simulate_chunk(runs):
+    """Run several vaults in one worker call.
+
+    Arguments:
+    runs -- (scenario, seed, days) of each vault
+
+    Returns:
+    list -- result of simulate() per vault
+    """
+    return [simulate(scenario, seed, days) for scenario, seed, days in runs]
+
+
+def run_batch(scenarios, seeds, days=365, workers=None, chunksize=None):
+    """Run every scenario once per seed on a process pool.
+
+    Vaults are handed to the workers in chunks, so short runs aren't
+    dominated by the cost of sending each one to a worker and back.
+
+    Arguments:
+    scenarios -- scenario dicts, eg. from scenario_grid()
+    seeds -- seeds to run each scenario with
+    days -- most days to run each vault for (default: 365)
+    workers -- number of worker processes (default: None, one per CPU)
+    chunksize -- vaults per worker call (default: None, about four calls per worker)
+
+    Yields:
+    dict -- result of simulate(), as each chunk of vaults finishes
+    """
+    workers = workers or os.cpu_count() or 1
+    runs = [(scenario, seed, days) for scenario in scenarios for seed in seeds]
+    if chunksize is None:
+        chunksize = max(1, len(runs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(simulate_chunk, runs[x:x + chunksize]) for x in range(0, len(runs), chunksize)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def aggregate(results):
+    """Aggregate results into one row per scenario.
+
+    Arguments:
+    results -- results of simulate()
+
+    Returns:
+    list -- dict per scenario, in scenario order
+    """
+    groups = {}
+    for result in results:
+        key = tuple(result["scenario"].items())
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, runs in sorted(groups.items()):
+        runs.sort(key=lambda run: run["seed"])
+        count = len(runs)
+        row = dict(key)
+        row["runs"] = count
+        row["survival_rate"] = sum(run["outcome"] == "running" for run in runs) / count
+        row["survival_day"] = sum(run["survival_day"] for run in runs) / count
+        row["population"] = sum(run["population"][-1] if run["population"] else 0 for run in runs) / count
+        row["peak_population"] = max(max(run["population"], default=0) for run in runs)
+        row["happiness"] = sum(run["happiness"][-1] if run["happiness"] else 0 for run in runs) / count
+        row["inventory_value"] = sum(run["inventory_value"] for run in runs) / count
+        row["final_caps"] = sum(run["caps"] for run in runs) / count
+        rows.append(row)
+    return rows
+
+
+def format_table(rows):
+    """Lay aggregated rows out as a text table.
+
+    Arguments:
+    rows -- rows from aggregate()
+
+    Returns:
+    str -- table with a header line
+    """
+    if not rows:
+        return "No results."
+    columns = list(rows[0])
+    cells = [[format_cell(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(line[x]) for line in cells)) for x, column in enumerate(columns)]
+    lines = ["  ".join(column.rjust(width) for column, width in zip(columns, widths))]
+    lines.extend("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+    return "\n".join(lines)
+
+
+def format_cell(value):
+    """Format one table cell.
+
+    Arguments:
+    value -- value of cell
+
+    Returns:
+    str -- value, with floats to one decimal
+    """
+    if isinstance(value, float):
+        return f"{value:.1f}"
+    return str(value)
+
+
+def main(argv=None):
+    """Run a sweep from the command line.
+
+    Arguments:
+    argv -- command line arguments (default: None, sys.argv)
+    """
+    parser = argparse.ArgumentParser(description="Run a grid of Fallout Shelter vaults in parallel.")
+    parser.add_argument("--caps", type=int, nargs="+", help="starting caps to try")
+    parser.add_argument("--raid-odds", type=int, nargs="+", help="one day in N has a raid from day 11, 0 for none")
+    parser.add_argument("--rush", nargs="+", choices=RUSH_STRATEGIES, help="rush strategies to try")
+    parser.add_argument("--feeding", nargs="+", choices=FEEDING, help="feeding policies to try")
+    parser.add_argument("--seeds", type=int, default=10, help="number of seeds per scenario (default: 10)")
+    parser.add_argument("--days", type=int, default=365, help="most days to run each vault for (default: 365)")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--csv", help="also write the aggregated table to this CSV file")
+    args = parser.parse_args(argv)
+
+    scenarios = scenario_grid(caps=args.caps, raid_odds=args.raid_odds, rush=args.rush, feeding=args.feeding)
+    seeds = range(args.seeds)
+    total = len(scenarios) * len(seeds)
+    results = []
+    start = time.perf_counter()
+    for result in run_batch(scenarios, seeds, args.days, args.workers):
+        results.append(result)
+        settings = " ".join(f"{name}={value}" for name, value in result["scenario"].items())
+        print(f"[{len(results)}/{total}] {settings} seed={result['seed']}: "
+              f"{result['outcome']} on day {result['survival_day']}", file=sys.stderr)
+
+    rows = aggregate(results)
+    print(format_table(rows))
+    print(f"\n{total} vaults in {time.perf_counter() - start:.1f}s on {args.workers or os.cpu_count()} workers")
+    if args.csv and rows:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Memory benchmark: bytes per inhabitant and per room.
+
+Builds populations of NPCs the way the game does (registered in a
+Population, with a first name, surname and parents) and measures the memory
+they take with tracemalloc. The record line gives the size of the objects
+themselves (plus their __dict__, if they have one), without the names and
+registry entries they refer to.
+
+Every figure is given twice: for the __slots__ records the game uses, and
+for stand-ins holding the same attributes in a per-instance __dict__, the
+layout Humans and Rooms had before they declared __slots__.
+
+Usage: python bench_memory.py [size ...]
+"""
+
+import sys
+import tracemalloc
+
+from Human import NPC, Population, Player
+from Room import Room
+
+SIZES = (1000, 10000, 100000)
+ROOM_TYPES = ("living", "generator", "storage", "kitchen", "trader", "water works", "radio")
+
+# Stand-in classes with a __dict__, one per record class so each keeps its own shared keys.
+DICT_CLASSES = {cls: type("Dict" + cls.__name__, (object,), {}) for cls in (NPC, Player, Room)}
+
+
+def measure(build):
+    """Measure memory still allocated after building something.
+
+    Arguments:
+    build -- function building and returning the objects to measure
+
+    Returns:
+    int -- bytes allocated by build that are still in use
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return after - before
+
+
+def record_size(obj):
+    """Get the size of an object and its attribute dict.
+
+    Arguments:
+    obj -- object to measure
+
+    Returns:
+    int -- bytes taken by the object record
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def slot_names(cls):
+    """Get every slot of a class, base classes first.
+
+    Arguments:
+    cls -- class declaring __slots__
+
+    Returns:
+    list -- slot names
+    """
+    return [name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())]
+
+
+def as_dict_record(obj):
+    """Copy a record into a stand-in keeping its attributes in a __dict__.
+
+    Stats kept in underscored slots get their public names back, as they
+    had before __slots__.
+
+    Arguments:
+    obj -- Human or Room
+
+    Returns:
+    object -- stand-in with the same attributes
+    """
+    record = DICT_CLASSES[type(obj)]()
+    for name in slot_names(type(obj)):
+        if hasattr(obj, name):
+            setattr(record, name.lstrip("_"), getattr(obj, name))
+    return record
+
+
+def build_population(size, layout=None):
+    """Build a Population of NPCs.
+
+    Arguments:
+    size -- number of inhabitants
+    layout -- function turning each NPC into the record stored (default: None, the NPC itself)
+
+    Returns:
+    Population -- populated registry
+    """
+    people = Population()
+    for x in range(size):
+        person = NPC(f"Name{x}", 1, f"Surname{x % 100}", f"Mother{x % 100}", 20, "male")
+        people.add(layout(person) if layout is not None else person)
+    return people
+
+
+def build_rooms(player, size, layout=None):
+    """Build a list of rooms of every type.
+
+    Arguments:
+    player -- player object
+    size -- number of rooms
+    layout -- function turning each Room into the record stored (default: None, the Room itself)
+
+    Returns:
+    list -- Rooms
+    """
+    rooms = [Room(ROOM_TYPES[x % len(ROOM_TYPES)], player) for x in range(size)]
+    return [layout(room) for room in rooms] if layout is not None else rooms
+
+
+def main(sizes):
+    """Print bytes per inhabitant and per room for each size, with __dict__ records and with __slots__."""
+    player = Player("Bench", 1, "Mark", "Mum", 20, "male")
+    npc = NPC("Bench", 1, "Mark", "Mum", 20, "male")
+    room = Room("kitchen", player)
+    for label, layout in (("__dict__", as_dict_record), ("__slots__", lambda obj: obj)):
+        print(f"record ({label}): NPC {record_size(layout(npc))} bytes, Player {record_size(layout(player))} bytes, "
+              f"Room {record_size(layout(room))} bytes")
+    print(f"{'size':>8} {'bytes/inhabitant':>26} {'bytes/room':>20}")
+    print(f"{'':>8} {'__dict__':>12} {'__slots__':>13} {'__dict__':>10} {'__slots__':>9}")
+    for size in sizes:
+        people = [measure(lambda: build_population(size, layout)) / size for layout in (as_dict_record, None)]
+        rooms = [measure(lambda: build_rooms(player, size, layout)) / size for layout in (as_dict_record, None)]
+        print(f"{size:>8} {people[0]:>12.0f} {people[1]:>13.0f} {rooms[0]:>10.0f} {rooms[1]:>9.0f}")
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or SIZES)
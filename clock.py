@@ -0,0 +1,93 @@
+"""Clocks used for the game's pacing delays.
+
+Every delay the game asks for is added to the clock's total_delay, so even a
+fast-forwarded run can report how long a human session would have taken.
+"""
+
+from time import sleep
+
+
+class RealClock(object):
+    """Clock waiting for the full length of every delay."""
+
+    def __init__(self):
+        """RealClock constructor."""
+        self.total_delay = 0.0
+
+    def sleep(self, seconds):
+        """Wait and record the delay.
+
+        Arguments:
+        seconds -- length of delay
+        """
+        self.total_delay += seconds
+        sleep(seconds)
+
+    def advance(self, seconds):
+        """Record a delay without waiting for it.
+
+        Arguments:
+        seconds -- length of delay
+        """
+        self.total_delay += seconds
+
+    def reset(self):
+        """Forget all recorded delay."""
+        self.total_delay = 0.0
+
+
+class ScaledClock(RealClock):
+    """Clock running delays faster or slower than real time."""
+
+    def __init__(self, factor):
+        """ScaledClock constructor.
+
+        Arguments:
+        factor -- speed-up factor, eg. 10 waits a tenth of every delay
+        """
+        RealClock.__init__(self)
+        self.factor = factor
+
+    def sleep(self, seconds):
+        """Wait for the scaled delay and record the full one.
+
+        Arguments:
+        seconds -- length of delay
+        """
+        self.total_delay += seconds
+        sleep(seconds / self.factor)
+
+
+class VirtualClock(RealClock):
+    """Clock that never waits and only counts delays."""
+
+    def sleep(self, seconds):
+        """Record the delay without waiting.
+
+        Arguments:
+        seconds -- length of delay
+        """
+        self.total_delay += seconds
+
+
+clock = RealClock()
+
+
+def set_clock(new_clock):
+    """Use a clock for all further delays.
+
+    Arguments:
+    new_clock -- clock to use
+
+    Returns:
+    previous -- clock that was in use before
+    """
+    global clock
+    previous = clock
+    clock = new_clock
+    return previous
+
+
+def get_clock():
+    """Get the clock currently in use."""
+    return clock
@@ -0,0 +1,569 @@
+"""Command registry and the handlers of every player command.
+
+A command line is split into words once, the first word is looked up in the
+registry and its handler is called with the vault and the remaining words.
+Handlers only talk to the vault, so commands behave the same whether they
+come from the keyboard, a script or any other command source.
+"""
+
+from crafting import planner
+from general_funcs import print_line
+from Item import Item
+from Room import Room
+from rationing import POLICIES
+import raid_risk
+import snapshot
+import trading
+
+# Help text shown by the help command, by group.
+HELP = (
+    ("Room actions", (
+        ("see rooms", "View all rooms"),
+        ("build x", "Construct room 'x'"),
+        ("rush x", "Rush construction of room 'x'"),
+        ("upgrade x", "Upgrade room 'x'"),
+        ("fix x", "Fix damaged room 'x'"),
+    )),
+    ("Inhabitant actions", (
+        ("see people", "View all inhabitants"),
+        ("feed x", "Feed inhabitant 'x'"),
+        ("enable auto_feed", "Enable automatically feeding inhabitants"),
+        ("ration x", "Share food and water out by policy 'x' (neediest, even, workers)"),
+        ("disable auto_feed", "Disable automatically feeding inhabitants"),
+        ("coitus x y", "Send inhabitants 'x' and 'y' to the love-house"),
+        ("scavenge x", "Send inhabitant 'x' to scavenge in the wasteland"),
+        ("heal x", "Heal inhabitant 'x'"),
+        ("heal all", "Heal all inhabitants"),
+        ("assign x y", "Assign inhabitant 'x' to room 'y'"),
+        ("auto assign", "Automatically assign unassigned inhabitants to rooms"),
+    )),
+    ("Inventory actions", (
+        ("see items", "View all held items"),
+        ("plan x", "Plan crafting item 'x' from its components' components too ('plan 5 x' for five)"),
+        ("craft x", "Craft item 'x' from its components ('craft 5 x' for five)"),
+        ("scrap x", "Destroy item and add its components to your inventory ('scrap 5 x' for five)"),
+        ("trade", "Begin trading interaction"),
+        ("trade x", "Settle order 'x' at once, eg. trade buy 5 food, sell 3 gun"),
+    )),
+    ("Other actions", (
+        ("skip", "Skip current day"),
+        ("see day", "View day number"),
+        ("see resources", "View all resources available"),
+        ("risk x", "Forecast what raids could cost over the next 'x' days (default 30)"),
+        ("save x", "Save the vault to file 'x'"),
+        ("end", "Quit game"),
+        ("help", "See this help text"),
+    )),
+)
+
+
+class Command(object):
+    """A registered command: its handler and the arguments it accepts."""
+
+    def __init__(self, verb, handler, min_args=0, max_args=None, usage=""):
+        """Command constructor.
+
+        Arguments:
+        verb -- first word of the command
+        handler -- function called with the vault and the other words
+        min_args -- fewest words accepted after the verb (default: 0)
+        max_args -- most words accepted after the verb (default: None, any)
+        usage -- message printed when the number of words is wrong
+        """
+        self.verb = verb
+        self.handler = handler
+        self.min_args = min_args
+        self.max_args = max_args
+        self.usage = usage
+
+    def accepts(self, args):
+        """Check if the command accepts a list of arguments.
+
+        Arguments:
+        args -- words after the verb
+
+        Returns:
+        bool -- whether the number of words is allowed
+        """
+        if len(args) < self.min_args:
+            return False
+        return self.max_args is None or len(args) <= self.max_args
+
+
+class CommandRegistry(object):
+    """Table of commands, keyed by verb."""
+
+    def __init__(self):
+        """CommandRegistry constructor."""
+        self.commands = {}
+
+    def __contains__(self, verb):
+        """Check if a verb is registered."""
+        return verb in self.commands
+
+    def register(self, verb, min_args=0, max_args=None, usage=""):
+        """Register the decorated function as the handler of a verb.
+
+        Arguments:
+        verb -- first word of the command
+        min_args -- fewest words accepted after the verb (default: 0)
+        max_args -- most words accepted after the verb (default: None, any)
+        usage -- message printed when the number of words is wrong
+
+        Returns:
+        function -- decorator registering the handler
+        """
+        def decorator(handler):
+            self.commands[verb] = Command(verb, handler, min_args, max_args, usage)
+            return handler
+        return decorator
+
+    def dispatch(self, vault, line):
+        """Run a command line.
+
+        Arguments:
+        vault -- VaultSimulation to run the command on
+        line -- command line, eg. "build kitchen"
+        """
+        words = line.split()
+        if not words:
+            print_line("You have to choose something!")
+            return
+        command = self.commands.get(words[0])
+        if command is None:
+            print_line("Invalid Input. Try again.")
+            return
+        args = words[1:]
+        if not command.accepts(args):
+            print_line(command.usage)
+            return
+        command.handler(vault, args)
+
+
+registry = CommandRegistry()
+
+
+def print_help():
+    """Print list of commands available to player."""
+    lines = ["Commands:", ""]
+    for group, entries in HELP:
+        lines.append(f"    {group}:")
+        for usage, description in entries:
+            lines.append(f"    {usage:<20}: {description}")
+        lines.append("")
+    print_line("\n".join(lines), fast=True)
+
+
+@registry.register("build", min_args=1, usage="You have to input 2 or more words to build a room.")
+def do_build(vault, args):
+    """Build a room: build <room>."""
+    potential_room = ' '.join(args)
+    if not vault.check_room(potential_room):
+        print_line(f"Checking for room: {potential_room}")
+        print_line("This room doesn't exist.")
+    elif vault.check_built_room(potential_room):
+        print_line("You've already built this room.")
+    else:
+        room = Room(potential_room, vault.player)
+        can_craft = True
+        for component in dict.fromkeys(room.components):
+            if room.count_component(component) > vault.count_item(component, "player"):
+                print_line(f"You don't have enough {component} to build {potential_room}")
+                can_craft = False
+        if can_craft:
+            print_line(f"You have built a {potential_room}")
+            vault.build(potential_room)
+
+
+@registry.register("craft", min_args=1, max_args=2,
+                   usage="Invalid Input. Either enter (craft gun) or (craft 5 gun)")
+def do_craft(vault, args):
+    """Craft items: craft <item> or craft <number> <item>."""
+    if len(args) == 2 and (not args[0].isdigit() or int(args[0]) not in range(1, 100)):
+        print_line("Invalid input. You can craft an item up to 99 times (If you have the components).")
+        return
+    name = args[-1]
+    number = int(args[0]) if len(args) == 2 else 1
+    if name not in vault.all_items:
+        print_line("Invalid item. Try again.")
+        return
+    actual_item = Item(name)
+    if len(actual_item.components) == 0:
+        print_line("This is a basic item and so cannot be crafted.")
+        return
+    can_craft = True
+    for component in dict.fromkeys(actual_item.components):
+        if actual_item.count_component(component) * number > vault.count_item(component, "player"):
+            print_line(f"You don't have enough {component} to craft {name}")
+            can_craft = False
+    if can_craft:
+        print_line(f"You have crafted a {name}" if number == 1 else f"You have crafted {number} {name}")
+        vault.craft(name, number)
+
+
+@registry.register("plan", min_args=1, max_args=2,
+                   usage="Invalid Input. Either enter (plan turret) or (plan 5 turret)")
+def do_plan(vault, args):
+    """Plan crafting through the whole recipe graph: plan <item> or plan <number> <item>."""
+    if len(args) == 2 and (not args[0].isdigit() or int(args[0]) < 1):
+        print_line("Invalid input. You have to plan at least one item.")
+        return
+    name = args[-1]
+    number = int(args[0]) if len(args) == 2 else 1
+    if name not in vault.all_items:
+        print_line("Invalid item. Try again.")
+        return
+    if not planner.recipe(name):
+        print_line("This is a basic item and so cannot be crafted.")
+        return
+    plan = planner.plan(name, number, vault.inventory)
+    print_line(f"To craft {number} {name}:")
+    for item, units in plan.crafts:
+        print_line(f"    craft {units} {item}")
+    for item, units in plan.used.items():
+        print_line(f"    use {units} {item} you hold")
+    if not plan.possible:
+        for item, units in plan.missing.items():
+            print_line(f"You are missing {units} {item}")
+        most = planner.most_craftable(name, vault.inventory)
+        print_line(f"You can craft at most {most} {name} right now.")
+        return
+    confirm = vault.ask("Craft it all now? ")
+    if confirm[:1].lower() == "y" and vault.craft_plan(plan):
+        print_line(f"You have crafted {number} {name}")
+
+
+@registry.register("scrap", min_args=1, max_args=2,
+                   usage="Invalid Input. Either enter (scrap wood) or (scrap 5 wood)")
+def do_scrap(vault, args):
+    """Scrap items: scrap <item> or scrap <number> <item>."""
+    if len(args) == 1:
+        if args[0] not in vault.all_items:
+            print_line("Invalid item. Please try again.")
+        elif vault.count_item(args[0], "player") > 0:
+            vault.scrap(args[0])
+        else:
+            print_line("You don't have that item.")
+    elif not args[0].isdigit() or int(args[0]) not in range(1, 100):
+        print_line("Invalid input. You can scrap an item up to 99 times (If you have that many).")
+    elif args[1] not in vault.all_items:
+        print_line("This item doesn't exist.")
+    elif vault.count_item(args[1], "player") < int(args[0]):
+        print_line("You don't have enough of these items to scrap that many times.")
+    else:
+        vault.scrap(args[1], int(args[0]))
+
+
+@registry.register("rush", min_args=1, usage="This room doesn't exist.")
+def do_rush(vault, args):
+    """Rush a room's production: rush <room>."""
+    potential_room = ' '.join(args)
+    room = vault.rooms.get(potential_room)
+    if not vault.check_room(potential_room):
+        print_line("This room doesn't exist.")
+    elif room is None:
+        print_line("You haven't built this room yet.")
+    elif not room.can_rush:
+        print_line("This room cannot be rushed")
+    elif room.rushed:
+        print_line("This room has already been rushed.")
+    elif room.risk > vault.rng["rooms"].randint(0, 9):
+        print_line(f"{room.name} has failed to rush and is broken!")
+        room.broken = True
+        room.invalidate()
+    else:
+        check = vault.ask(f"Are you sure? {room.name} has a {room.risk * 10}% chance of breaking.")
+        if check[:1].lower() == "y":
+            room.rush()
+        else:
+            print_line("Rush failed.")
+
+
+@registry.register("fix", min_args=1, usage="This room doesn't exist.")
+def do_fix(vault, args):
+    """Fix a broken room: fix <room>."""
+    potential_room = ' '.join(args)
+    room = vault.rooms.get(potential_room)
+    if not vault.check_room(potential_room):
+        print_line("This room doesn't exist.")
+    elif room is None:
+        print_line("You haven't built this room yet.")
+    elif not room.broken:
+        print_line("This room isn't even broken. There's no need to fix it!")
+    else:
+        items_needed = [it for it in room.components if vault.rng["rooms"].randint(0, 1)]
+        can_fix = True
+        for it in dict.fromkeys(items_needed):
+            available = vault.count_item(it, 'player')
+            needed = room.count_component(it)
+            if needed > available:
+                print_line(f"You need {needed - available} more {it} to fix this room.")
+                can_fix = False
+        if can_fix:
+            room.broken = False
+            room.invalidate()
+            for it in items_needed:
+                Item(it).destroy(vault.inventory)
+            print_line(f"{room.name} has been fixed and is now in full working order.")
+
+
+@registry.register("see", min_args=1,
+                   usage="Incorrect input. You can (see people), (see inventory), (see rooms) or (see resources)")
+def do_see(vault, args):
+    """Show part of the vault: see people|items|rooms|day|resources."""
+    if args[0] == "people":
+        vault.see_people()
+    elif args[0] == "items":
+        vault.see_inventory("player")
+    elif args[0] == "rooms":
+        vault.see_rooms()
+    elif args[0] == "day":
+        print_line(f"Today is day {vault.day_count}")
+    elif args[0] == "resources":
+        vault.see_resources()
+    else:
+        print_line("Incorrect input. You can (see people), (see inventory), (see rooms) or (see resources)")
+
+
+@registry.register("coitus", min_args=4, max_args=4,
+                   usage="You need to input 2 mature people of opposite genders in the form "
+                         "(coitus Alex Marshall Mallus Cumberland)")
+def do_coitus(vault, args):
+    """Have two inhabitants try for a child: coitus <name> <surname> <name> <surname>."""
+    if not vault.check_person(args[0], args[1]):
+        print_line(f"No such {args[0]} {args[1]} exists!")
+    elif not vault.check_person(args[2], args[3]):
+        print_line(f"No such {args[2]} {args[3]} exists!")
+    elif len(vault.people) == vault.living_capacity():
+        print_line("You've reached the vault's maximum capacity. Upgrade your living room to hold more people")
+    else:
+        person_1 = vault.people.find(args[0], args[1])
+        person_2 = vault.people.find(args[2], args[3])
+        if (person_1.partner == "" and person_2.partner == "") or person_1.partner == f"{person_2.name} {person_2.surname}":
+            if person_1.age < 18:
+                print_line(f"{args[0]} isn't old enough to copulate.")
+            elif person_2.age < 18:
+                print_line(f"{args[2]} isn't old enough to copulate.")
+            elif person_1.surname == person_2.surname:
+                print_line("Incest isn't allowed. At least be ethical!")
+            elif person_1.gender == person_2.gender:
+                print_line("The people need to be different genders! COME ON MAN CAN U EVEN BIOLOGY!?")
+            else:
+                vault.create_NPC(person_1, person_2)
+        else:
+            print_line("Infidelity shall not be allowed!!!")
+            for person in (person_1, person_2):
+                if person.partner != "":
+                    print_line(f"{person.name} {person.surname} is married to {person.partner}")
+                else:
+                    print_line(f"{person.name} {person.surname} isn't married.")
+
+
+@registry.register("feed", min_args=1, max_args=1,
+                   usage="Invalid input! Can only feed one person like this. Use the auto_feed system to feed everyone.")
+def do_feed(vault, args):
+    """Feed one inhabitant: feed <name>."""
+    if vault.avg_hunger() < 2:
+        print_line("Your people are working on full bellies boss!")
+        return
+    person = vault.find_by_first_name(args[0])
+    if person is None:
+        print_line("This person doesn't exist.")
+        return
+    amount = vault.ask(f"Feed {args[0]} by how much? ")
+    if not amount.isdigit():
+        print_line("Only numbers are accepted")
+    # The amount is checked against the food held. The original game compared it
+    # with the person's hunger, so it refused small feeds and allowed ones it
+    # couldn't cover.
+    elif int(amount) > vault.count_item("food", "player"):
+        print_line(f"You don't have enough food to feed {args[0]}")
+    else:
+        vault.feed(person.name, person.surname, int(amount))
+
+
+@registry.register("trade")
+def do_trade(vault, args):
+    """Trade with the trader: trade, or trade <order> to settle one order, eg. trade buy 5 food, sell 3 gun."""
+    trader = vault.rooms.get('trader')
+    if trader is None:
+        print_line("You haven't built a trader room yet!")
+    elif trader.count_assigned() == 0:
+        print_line("No one has been assigned to this room! You can't trade until then.")
+    elif not args:
+        vault.trade()
+    else:
+        try:
+            vault.report_trade(trading.settle(vault, " ".join(args)))
+        except trading.TradeError as error:
+            print_line(str(error))
+
+
+@registry.register("assign", min_args=4,
+                   usage="You have to input 4 or more words. E.g., assign Thomas Marc to living")
+def do_assign(vault, args):
+    """Assign an inhabitant to a room: assign <name> <surname> to <room>."""
+    potential_room = ' '.join(args[3:])
+    room = vault.rooms.get(potential_room)
+    if not vault.check_person(args[0], args[1]):
+        print_line(f"This {args[0]} doesn't exist.")
+    elif not vault.check_room(potential_room):
+        print_line("This room doesn't exist.")
+    elif room is None:
+        print_line("You haven't built this room yet")
+    elif room.assigned_limit == room.count_assigned():
+        print_line("This room is full.")
+        print_line("You can assign someone in the room to another room to create space.")
+    else:
+        vault.people.find(args[0], args[1]).assign_to_room(room, vault.assignments)
+
+
+@registry.register("auto", min_args=1, max_args=1, usage="Invalid input. You can (auto assign)")
+def do_auto(vault, args):
+    """Assign unassigned inhabitants automatically: auto assign."""
+    if args[0] == "assign":
+        vault.auto_assign()
+    else:
+        print_line("Invalid input. You can (auto assign)")
+
+
+@registry.register("upgrade", min_args=1, usage="This room doesn't exist. Try again.")
+def do_upgrade(vault, args):
+    """Upgrade a room: upgrade <room>."""
+    potential_room = ' '.join(args)
+    r = vault.rooms.get(potential_room)
+    if not vault.check_room(potential_room) or r is None:
+        print_line("This room doesn't exist. Try again.")
+    elif potential_room == "trader":
+        print_line("This room cannot be upgraded")
+    else:
+        items_needed = r.components * r.level
+        for ite in vault.all_items:
+            if vault.count_item(ite, "player") < items_needed.count(ite):
+                print_line(f"You don't have enough {ite} to upgrade your {r.name}")
+                return
+        for component in items_needed:
+            vault.inventory.remove(component)
+        vault.rooms.upgrade(r)
+        print_line(f"{r.name} has been upgraded and is now level {r.level}")
+
+
+@registry.register("disable", min_args=1, usage="Invalid input. You can disable the 'auto_feed' system.")
+def do_disable(vault, args):
+    """Turn auto feeding off: disable auto_feed."""
+    if args[0] == "auto_feed":
+        vault.auto_feed = False
+        print_line("Warning. You have disabled the auto_feed feature. Be careful, your people may starve!")
+    else:
+        print_line("Invalid input. You can disable the 'auto_feed' system.")
+
+
+@registry.register("enable", min_args=1, usage="Invalid Input. You can enable the 'auto_feed' system.")
+def do_enable(vault, args):
+    """Turn auto feeding on: enable auto_feed."""
+    if args[0] == "auto_feed":
+        vault.auto_feed = True
+        print_line("Auto-feed system is working optimally.")
+    else:
+        print_line("Invalid Input. You can enable the 'auto_feed' system.")
+
+
+@registry.register("ration", min_args=1, usage="Invalid input. Ration policies are: " + ", ".join(POLICIES))
+def do_ration(vault, args):
+    """Pick how food and water are shared out: ration <policy>."""
+    if args[0] in POLICIES:
+        vault.ration_policy = args[0]
+        print_line(f"Food and water will be shared out by the '{vault.ration_policy}' policy.")
+    else:
+        print_line("Invalid input. Ration policies are: " + ", ".join(POLICIES))
+
+
+@registry.register("scavenge", min_args=1, usage="This person doesn't exist.")
+def do_scavenge(vault, args):
+    """Send an inhabitant out scavenging: scavenge <name>."""
+    person = vault.find_by_first_name(args[0])
+    if person is None or person is vault.player:
+        print_line("This person doesn't exist.")
+    elif person.scavenging:
+        print_line("This person is already out scavenging.")
+    else:
+        days = vault.ask("Would you like to scavenge for a certain number of days or until their health gets low? (1-100/H) ")
+        try:
+            days = int(days)
+        except ValueError:
+            pass
+        vault.scavenge(person.name, person.surname, days)
+
+
+@registry.register("heal", min_args=1, usage="That person doesn't exist.")
+def do_heal(vault, args):
+    """Heal inhabitants: heal <name> or heal all."""
+    if args[0] == "all":
+        for person in vault.people:
+            person.heal(100, vault.player)
+        return
+    person = vault.find_by_first_name(args[0])
+    if person is None:
+        print_line("That person doesn't exist.")
+    elif vault.count_item("stimpack", "player") > 0:
+        person.heal(100, vault.player)
+        vault.inventory.remove("stimpack")
+
+
+@registry.register("skip")
+def do_skip(vault, args):
+    """End the day: skip."""
+    vault.skip = True
+
+
+@registry.register("risk", max_args=1, usage="Invalid input. You can forecast raids like this: risk 30")
+def do_risk(vault, args):
+    """Forecast raid losses: risk [days]."""
+    if args and not args[0].isdigit():
+        print_line("Only numbers are accepted")
+        return
+    days = int(args[0]) if args else 30
+    try:
+        # Today's raid has already been rolled, so look ahead from tomorrow.
+        forecast = raid_risk.forecast_raids(vault, days, start=vault.day_count + 1)
+    except ImportError as error:
+        print_line(str(error))
+        return
+    summary = forecast.summary()
+    print_line(
+        f"Raid forecast for the next {days} days ({summary['trials']} trials):",
+        f"Chance of at least one raid: {summary['raid_probability']:.0%}",
+        f"Chance of losing someone in a raid: {summary['death_probability']:.0%}",
+        f"Items lost: {summary['items_lost_mean']:.1f} on average, "
+        f"{summary['items_lost_p90']:.0f} or fewer in 9 out of 10 trials")
+    losses = sorted(summary["expected_losses"].items(), key=lambda pair: pair[1], reverse=True)
+    losses = [(item, mean) for item, mean in losses[:5] if mean >= 0.05]
+    if losses:
+        print_line("Items most likely to go:")
+        for item, mean in losses:
+            print_line(f"    {item}: {mean:.1f} on average")
+
+
+@registry.register("save", min_args=1, max_args=1, usage="You have to name the file to save to, eg. save vault.sav")
+def do_save(vault, args):
+    """Save the vault to a snapshot file: save <file>."""
+    try:
+        snapshot.save(vault, args[0])
+    except OSError as error:
+        print_line(f"Couldn't save the vault: {error.strerror}.")
+        return
+    print_line(f"Vault saved to {args[0]}.")
+
+
+@registry.register("end")
+def do_end(vault, args):
+    """Quit the game: end."""
+    confirm = vault.ask("Are you sure? All unsaved data will be lost! ")
+    if confirm[:1].lower() == "y":
+        vault.player_quit = True
+
+
+@registry.register("help")
+def do_help(vault, args):
+    """Show the list of commands: help."""
+    print_help()
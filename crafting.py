@@ -0,0 +1,229 @@
+"""Crafting planner working over the whole recipe graph of the items file.
+
+An item's components can themselves be crafted, eg. a turret needs a chip,
+which needs wire, which needs copper. The planner follows those recipes
+down to basic items, using what is already held before crafting more:
+
+    plan = planner.plan("turret", 2, vault.inventory)
+    if plan.possible:
+        vault.craft_plan(plan)
+    else:
+        print(plan.missing)
+
+The recipes, the order items are worked out in and the bill of basic items
+for one unit of each item are worked out once and kept, until the item
+catalog is reloaded.
+"""
+
+from collections import Counter
+
+from Item import catalog
+
+
+class RecipeError(ValueError):
+    """Raised when the recipes in the items file can't be followed."""
+
+
+class CraftPlan(object):
+    """Crafts needed to make a number of an item from a given inventory."""
+
+    def __init__(self, target, number, crafts, used, missing):
+        """CraftPlan constructor.
+
+        Arguments:
+        target -- name of item to craft
+        number -- units of target to craft
+        crafts -- (item, units) of each craft, components before what they go into
+        used -- Counter of held units going into the crafts
+        missing -- Counter of basic units lacking
+        """
+        self.target = target
+        self.number = number
+        self.crafts = crafts
+        self.used = used
+        self.missing = missing
+
+    @property
+    def possible(self):
+        """Whether everything needed is held."""
+        return not self.missing
+
+    @property
+    def craft_count(self):
+        """Number of units crafted, intermediate ones included."""
+        return sum(units for item, units in self.crafts)
+
+
+class CraftPlanner(object):
+    """Plans crafts over the recipe graph of an item catalog."""
+
+    def __init__(self, items=catalog):
+        """CraftPlanner constructor.
+
+        Arguments:
+        items -- ItemCatalog to read recipes from (default: the shared catalog)
+        """
+        self.items = items
+        self.records = None
+        self.recipes = {}
+        self.orders = {}
+        self.bills = {}
+
+    def check_catalog(self):
+        """Forget everything worked out if the catalog has been reloaded."""
+        if self.items.records is None:
+            self.items.names()
+        if self.items.records is not self.records:
+            self.records = self.items.records
+            self.recipes = {}
+            self.orders = {}
+            self.bills = {}
+
+    def recipe(self, name):
+        """Get the components of one unit of an item.
+
+        Arguments:
+        name -- name of item
+
+        Returns:
+        Counter -- units of each component, empty for basic items
+        """
+        self.check_catalog()
+        recipe = self.recipes.get(name)
+        if recipe is None:
+            record = self.items.record(name)
+            if record is None:
+                raise RecipeError(f"Unknown item: {name}")
+            recipe = self.recipes[name] = Counter(record.components)
+        return recipe
+
+    def order(self, name):
+        """Get an item and everything that goes into it, each after every item it goes into.
+
+        Arguments:
+        name -- name of item
+
+        Returns:
+        list -- item names, name first
+        """
+        self.check_catalog()
+        order = self.orders.get(name)
+        if order is None:
+            finished = []
+            self.visit(name, finished, set(), set())
+            order = self.orders[name] = finished[::-1]
+        return order
+
+    def visit(self, name, finished, done, path):
+        """Add an item's components to finished, then the item.
+
+        Arguments:
+        name -- name of item
+        finished -- item names in the order they were finished
+        done -- names already finished
+        path -- names being visited, to catch recipes that go in circles
+        """
+        if name in path:
+            raise RecipeError(f"The recipe of {name} needs {name} itself.")
+        path.add(name)
+        for component in self.recipe(name):
+            if component not in done:
+                self.visit(component, finished, done, path)
+        path.discard(name)
+        done.add(name)
+        finished.append(name)
+
+    def bill(self, name):
+        """Get the basic items one unit of an item is made of, crafted from scratch.
+
+        Arguments:
+        name -- name of item
+
+        Returns:
+        Counter -- units of each basic item, the item itself if it is basic
+        """
+        self.check_catalog()
+        bill = self.bills.get(name)
+        if bill is None:
+            recipe = self.recipe(name)
+            if not recipe:
+                bill = Counter({name: 1})
+            else:
+                bill = Counter()
+                for component, units in recipe.items():
+                    for basic, per in self.bill(component).items():
+                        bill[basic] += per * units
+            self.bills[name] = bill
+        return bill
+
+    def plan(self, name, number, inventory):
+        """Plan crafting units of an item from an inventory.
+
+        Held units of components are used first, crafting only the rest.
+        The plan assumes every component is used up; crafting perks can
+        only leave more behind.
+
+        Arguments:
+        name -- name of item to craft
+        number -- units to craft
+        inventory -- Inventory to craft from, left untouched
+
+        Returns:
+        CraftPlan -- crafts to make, held units used and basic units missing
+        """
+        if not self.recipe(name):
+            raise RecipeError(f"{name} is a basic item and can't be crafted.")
+        needed = Counter({name: number})
+        crafts = []
+        used = Counter()
+        missing = Counter()
+        for item in self.order(name):
+            units = needed[item]
+            if not units:
+                continue
+            if item != name:
+                taken = min(inventory.count(item), units)
+                if taken:
+                    used[item] = taken
+                    units -= taken
+                if not units:
+                    continue
+            recipe = self.recipe(item)
+            if not recipe:
+                missing[item] = units
+                continue
+            crafts.append((item, units))
+            for component, per in recipe.items():
+                needed[component] += per * units
+        crafts.reverse()
+        return CraftPlan(name, number, crafts, used, missing)
+
+    def most_craftable(self, name, inventory):
+        """Find the most units of an item an inventory can be crafted into.
+
+        Arguments:
+        name -- name of item
+        inventory -- Inventory to craft from
+
+        Returns:
+        int -- most units that can be crafted
+        """
+        # Even the held intermediates are made of basics, so the bill bounds the answer.
+        basics = Counter()
+        for item, held in inventory.items():
+            if item == name:
+                continue
+            for basic, per in self.bill(item).items():
+                basics[basic] += per * held
+        high = min(basics[basic] // per for basic, per in self.bill(name).items())
+        low = 0
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.plan(name, middle, inventory).possible:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+
+planner = CraftPlanner()
@@ -1,6 +1,6 @@
 """General functions used by most modules in this project."""
 
-from time import sleep
+import output
 from config import LOAD_DELAY
 
 def input_int(s):
@@ -24,14 +24,15 @@ def input_int(s):
 def print_line(*messages, fast=True):
     """Replace print() with artificial line spacing.
 
+    Lines go to the current output sink, which decides on the pacing.
+
     Arguments:
     *messages -- any number of arguments to print
     """
     for message in messages:
         message = str(message)
         for line in message.splitlines():
-            sleep(LOAD_DELAY if fast else 0.5)
-            print(line)
+            output.emit(line, LOAD_DELAY if fast else 0.5)
 
 
 def load_time(x, message):
@@ -41,8 +42,7 @@ def load_time(x, message):
     x -- length of loading bar in seconds
     message -- message to print before loading bar
     """
-    print(str(message))
-    sleep(x / 10000)
+    output.loading(str(message), x / 10000)
 
 
 def count_item(item, target_inventory, inventory, trader_inventory):
@@ -51,8 +51,8 @@ def count_item(item, target_inventory, inventory, trader_inventory):
     Arguments:
     item -- item to count
     target_inventory -- inventory to count in
-    inventory -- player's inventory
-    trader_inventory -- trader's inventory
+    inventory -- player's Inventory
+    trader_inventory -- trader's Inventory
 
     Returns:
     int -- count of item in inventory
@@ -0,0 +1,773 @@
+"""Append-only journal of what changes in a vault each day.
+
+Rewriting a whole snapshot every day costs time in proportion to the size of
+the vault. A Journal keeps a snapshot file and, next to it, a journal that
+gets one record per day holding only what changed that day: engine fields,
+inventory deltas, the random streams that were drawn from, births, deaths,
+changed inhabitants and changed or newly built rooms. The hunger and thirst
+everyone gains from the daily upkeep is journaled once as the day's tick,
+so only inhabitants whose stats changed in other ways take up room. Every
+so often the journal is compacted: a fresh snapshot is written and the
+journal starts over. Journal.recover() loads the snapshot and replays the
+journal on top.
+
+The journal is JSON, one record per line, after a header line naming the
+day of the snapshot it extends. A record cut off by a crash is ignored, so
+recovery always lands on the end of a whole day.
+"""
+
+import base64
+import gc
+import json
+import os
+import struct
+from itertools import compress, count
+from operator import attrgetter, ne
+
+from Human import NPC
+from population_store import COLUMNS, DAILY_HUNGER, DAILY_THIRST
+import snapshot
+
+# Version 2 added the daily tick, which older versions would skip.
+JOURNAL_VERSION = 2
+
+# Inhabitant fields saved for the newborn.
+BIRTH_FIELDS = snapshot.STRING_FIELDS + ("day_of_birth", "defense")
+
+# Inhabitant fields that can change after birth, compared every day. Stats,
+# children, scavenging and room assignments are tracked separately.
+PERSON_FIELDS = ("partner", "assigned_room", "defense")
+
+# NPC fields that only change while they are out scavenging.
+SCAVENGING_FIELDS = ("scavenging", "days_scavenging", "days_to_scavenge_for")
+
+# Engine fields compared every day. used_names only ever grows, so it is
+# journaled as the names added.
+ENGINE_FIELDS = tuple(field for field in snapshot.ENGINE_FIELDS if field != "used_names")
+
+id_of = attrgetter("person_id")
+person_fields = attrgetter(*PERSON_FIELDS)
+own_stats = attrgetter(*("_" + name for name in COLUMNS))
+children_of = attrgetter("children")
+
+# Positions of the stats the daily tick changes, in own_stats() tuples.
+HUNGER = list(COLUMNS).index("hunger")
+THIRST = list(COLUMNS).index("thirst")
+
+
+class JournalError(ValueError):
+    """Raised when a journal can't be read."""
+
+
+class Journal(object):
+    """Snapshot file kept up to date by appending a record of each day's changes.
+
+    The journal lives next to the snapshot, at path + ".journal". Once a
+    Journal is started on a vault, the vault commits a record to it at the
+    end of every day.
+    """
+
+    def __init__(self, path, compact_every=100):
+        """Journal constructor.
+
+        Arguments:
+        path -- snapshot file
+        compact_every -- most days to journal before writing a fresh snapshot (default: 100)
+        """
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.days = 0
+        self.snapshot_size = 0
+        self.journal_size = 0
+        self.base = None
+
+    def start(self, vault):
+        """Write a snapshot of a vault and journal its days from now on.
+
+        Arguments:
+        vault -- VaultSimulation to journal
+        """
+        vault.journal = self
+        self.compact(vault)
+
+    def recover(self, commands=None, vectorized=None):
+        """Load the snapshot, replay the journal on top and carry on journaling.
+
+        Arguments:
+        commands -- command source of the vault (default: None, an empty ScriptedCommands)
+        vectorized -- keep stats in a PopulationStore (default: None, as when the snapshot was made)
+
+        Returns:
+        VaultSimulation -- vault as it was at the end of the last whole journaled day
+        """
+        vault = snapshot.load(self.path, commands, vectorized)
+        self.snapshot_size = os.path.getsize(self.path)
+        header, records, end = read_journal(self.journal_path)
+        if header is None or header["base_day"] != vault.day_count:
+            # No journal, or one left over from before the snapshot was
+            # replaced: the snapshot is already up to date.
+            self.reset(vault.day_count)
+        else:
+            replay(vault, records)
+            # Cut off a record left half written by a crash.
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(end)
+            self.days = len(records)
+            self.journal_size = end
+        vault.journal = self
+        self.base = Baseline(vault)
+        return vault
+
+    def commit(self, vault):
+        """Append the changes made to a vault since the last commit.
+
+        Compacts instead once the journal has run for compact_every days or
+        grown bigger than the snapshot.
+
+        Arguments:
+        vault -- VaultSimulation being journaled
+        """
+        if self.days >= self.compact_every or self.journal_size > self.snapshot_size:
+            self.compact(vault)
+            return
+        # Comparing makes a tuple per inhabitant and nothing that can form
+        # a cycle, so the collector is paused as it is for loading.
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            record = self.base.advance(vault)
+        finally:
+            if collecting:
+                gc.enable()
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with open(self.journal_path, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.days += 1
+        self.journal_size += len(line)
+
+    def compact(self, vault):
+        """Fold the journal into a fresh snapshot.
+
+        The new snapshot replaces the old one before the journal is emptied,
+        so a crash in between leaves a journal recover() knows to skip.
+
+        Arguments:
+        vault -- VaultSimulation being journaled
+        """
+        data = snapshot.dumps(vault)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        self.snapshot_size = len(data)
+        self.reset(vault.day_count)
+        self.base = Baseline(vault)
+
+    def reset(self, base_day):
+        """Start an empty journal.
+
+        Arguments:
+        base_day -- day of the snapshot the journal extends
+        """
+        header = json.dumps({"journal": JOURNAL_VERSION, "base_day": base_day}).encode("utf-8") + b"\n"
+        with open(self.journal_path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        self.days = 0
+        self.journal_size = len(header)
+
+
+class Baseline(object):
+    """State of a vault at the last commit, to tell what has changed since.
+
+    Values are kept by reference wherever the game replaces them rather
+    than changing them in place, so taking a baseline copies little more
+    than the stat columns. Inhabitants are kept in Population order, which
+    on most days hasn't changed, so they are compared list against list.
+    """
+
+    def __init__(self, vault):
+        """Baseline constructor.
+
+        Arguments:
+        vault -- VaultSimulation to take the state of
+        """
+        self.engine = {field: getattr(vault, field) for field in ENGINE_FIELDS}
+        self.used_names = len(vault.used_names)
+        self.inventory = dict(vault.inventory.items())
+        self.trader_inventory = dict(vault.trader_inventory.items())
+        self.rng = {name: stream.getstate() for name, stream in vault.rng.streams.items()}
+        self.perks = perks_of(vault.player)
+        self.next_ids = vault.people.next_id, vault.rooms.next_id
+        self.rooms = {room.room_id: room_fields(room) for room in vault.rooms}
+        self.room_of = {person_id: room.room_id for person_id, room in vault.assignments.room_of.items()}
+        self.scavengers = scavenging_fields(vault)
+
+        order = vault.people.order
+        self.ids = list(map(id_of, order))
+        self.fields = list(map(person_fields, order))
+        self.children = list(map(len, map(children_of, order)))
+        store = vault.people.store
+        if store is None:
+            self.stats = list(map(own_stats, order))
+        else:
+            self.row_ids = list(map(id_of, store.people))
+            self.stats = {name: store.column(name).copy() for name in COLUMNS}
+
+    def advance(self, vault):
+        """Get what has changed since the last commit and move up to now.
+
+        Arguments:
+        vault -- VaultSimulation being journaled
+
+        Returns:
+        dict -- journal record of the changes
+        """
+        record = {"day": vault.day_count}
+
+        engine = {field: getattr(vault, field) for field in ENGINE_FIELDS}
+        changed = {field: value for field, value in engine.items() if self.engine[field] != value}
+        if changed:
+            record["engine"] = changed
+        if len(vault.used_names) != self.used_names:
+            record["used_names"] = vault.used_names[self.used_names:]
+
+        for name in ("inventory", "trader_inventory"):
+            items = dict(getattr(vault, name).items())
+            delta = inventory_delta(getattr(self, name), items)
+            if delta:
+                record[name] = delta
+            setattr(self, name, items)
+
+        rng = {name: stream.getstate() for name, stream in vault.rng.streams.items()}
+        streams = {name: pack_stream(state) for name, state in rng.items() if self.rng[name] != state}
+        if streams:
+            record["rng"] = streams
+
+        perks = perks_of(vault.player)
+        changed = {perk: value for perk, value in perks.items() if self.perks.get(perk) != value}
+        if changed:
+            record["perks"] = changed
+
+        rooms = {room.room_id: room_fields(room) for room in vault.rooms}
+        built = [snapshot.room_record(vault.rooms.get_id(room_id)) for room_id in rooms if room_id not in self.rooms]
+        if built:
+            record["built"] = built
+        changed = []
+        for room_id, fields in rooms.items():
+            old = self.rooms.get(room_id)
+            if old is not None and old != fields:
+                changed.append([room_id, {field: getattr(vault.rooms.get_id(room_id), field)
+                                          for field, value, was in zip(snapshot.ROOM_FIELDS, fields, old)
+                                          if value != was}])
+        if changed:
+            record["rooms"] = changed
+
+        # The daily upkeep ran unless the baseline was taken partway through the day.
+        if not self.engine["day_started"]:
+            record["tick"] = [DAILY_HUNGER, DAILY_THIRST]
+        self.advance_people(vault, record)
+
+        next_ids = vault.people.next_id, vault.rooms.next_id
+        if next_ids != self.next_ids:
+            record["next_ids"] = list(next_ids)
+
+        self.engine = engine
+        self.used_names = len(vault.used_names)
+        self.rng = rng
+        self.perks = perks
+        self.rooms = rooms
+        self.next_ids = next_ids
+        return record
+
+    def advance_people(self, vault, record):
+        """Add births, deaths and changed inhabitants to a journal record.
+
+        Arguments:
+        vault -- VaultSimulation being journaled
+        record -- journal record being built
+        """
+        people = vault.people
+        order = people.order
+        ids = list(map(id_of, order))
+        fields = list(map(person_fields, order))
+        children = list(map(len, map(children_of, order)))
+        room_of = {person_id: room.room_id for person_id, room in vault.assignments.room_of.items()}
+        scavengers = scavenging_fields(vault)
+
+        if ids == self.ids:
+            previous = None
+            died = born = ()
+        else:
+            position = dict(zip(self.ids, range(len(self.ids))))
+            alive = set(ids)
+            previous = [position.get(person_id) for person_id in ids]
+            died = [person_id for person_id in self.ids if person_id not in alive]
+            born = [person_id for person_id in ids if person_id not in position]
+        if died:
+            record["died"] = died
+        if born:
+            record["born"] = [person_record(people.get(person_id), room_of.get(person_id)) for person_id in born]
+        died = set(died)
+        born = set(born)
+
+        changes = {}
+        old_fields = aligned(self.fields, previous, fields)
+        for x in compress(count(), map(ne, fields, old_fields)):
+            changes[ids[x]] = {field: value for field, value, was in zip(PERSON_FIELDS, fields[x], old_fields[x])
+                               if value != was}
+        for x in compress(count(), map(ne, children, aligned(self.children, previous, children))):
+            changes.setdefault(ids[x], {})["children"] = list(order[x].children)
+        old_room_of = self.room_of
+        for person_id in old_room_of.keys() | room_of.keys():
+            room_id = room_of.get(person_id)
+            if old_room_of.get(person_id) != room_id and person_id not in died and person_id not in born:
+                changes.setdefault(person_id, {})["room"] = room_id
+        old_scavengers = self.scavengers
+        for person_id in old_scavengers.keys() | scavengers.keys():
+            if person_id in died or person_id in born:
+                continue
+            values = scavenging_values(people.get(person_id))
+            if old_scavengers.get(person_id) != values:
+                changes.setdefault(person_id, {}).update(zip(SCAVENGING_FIELDS, values))
+        if changes:
+            record["people"] = [[person_id, change] for person_id, change in changes.items()]
+
+        out = scavengers.keys() - old_scavengers.keys()
+        back = old_scavengers.keys() - scavengers.keys()
+        if out or back:
+            record["scavengers"] = {"out": sorted(out), "back": sorted(back)}
+
+        tick = record.get("tick")
+        if people.store is None:
+            stats = list(map(own_stats, order))
+            old_stats = self.stats
+            if tick:
+                old_stats = [ticked(values, tick) for values in old_stats]
+            old_stats = aligned(old_stats, previous, stats)
+            changed = list(compress(count(), map(ne, stats, old_stats)))
+            if changed:
+                record["stats"] = {"ids": [ids[x] for x in changed]}
+                for column, name in enumerate(COLUMNS):
+                    values = [stats[x][column] for x in changed]
+                    if any(old_stats[x][column] != value for x, value in zip(changed, values)):
+                        record["stats"][name] = values
+            self.stats = stats
+        else:
+            self.advance_store(people.store, record)
+
+        self.ids = ids
+        self.fields = fields
+        self.children = children
+        self.room_of = room_of
+        self.scavengers = scavengers
+
+    def advance_store(self, store, record):
+        """Add changed stats and moved store rows to a journal record.
+
+        Stats are compared column by column against the rows each inhabitant
+        had at the last commit, plus the day's tick.
+
+        Arguments:
+        store -- PopulationStore of the vault
+        record -- journal record being built
+        """
+        import numpy as np
+
+        row_ids = list(map(id_of, store.people))
+        old_row_ids = self.row_ids
+        if row_ids == old_row_ids:
+            kept = before = np.arange(len(row_ids))
+        else:
+            record["rows"] = [[person_id, row] for row, person_id in enumerate(row_ids)
+                              if row >= len(old_row_ids) or old_row_ids[row] != person_id]
+            row_of = dict(zip(old_row_ids, range(len(old_row_ids))))
+            previous = np.fromiter((row_of.get(person_id, -1) for person_id in row_ids), dtype=np.intp,
+                                   count=len(row_ids))
+            kept = np.flatnonzero(previous >= 0)
+            before = previous[kept]
+
+        tick = dict(zip(("hunger", "thirst"), record.get("tick", ())))
+        differs = {}
+        changed = np.zeros(len(kept), dtype=bool)
+        for name in COLUMNS:
+            differs[name] = store.column(name)[kept] != self.stats[name][before] + tick.get(name, 0)
+            changed |= differs[name]
+        rows = kept[changed]
+        if len(rows):
+            record["stats"] = {"ids": [row_ids[row] for row in rows.tolist()]}
+            for name in COLUMNS:
+                if differs[name][changed].any():
+                    record["stats"][name] = store.column(name)[rows].tolist()
+
+        self.row_ids = row_ids
+        self.stats = {name: store.column(name).copy() for name in COLUMNS}
+
+
+def aligned(old, previous, new):
+    """Line values from the last commit up with the current inhabitants.
+
+    Arguments:
+    old -- values at the last commit, in the Population order of then
+    previous -- position at the last commit of each current inhabitant, None
+                for the newborn, or None if the order hasn't changed
+    new -- current values, in Population order
+
+    Returns:
+    list -- old value of each current inhabitant, or the current value for
+            the newborn so they never count as changed
+    """
+    if previous is None:
+        return old
+    return [value if x is None else old[x] for x, value in zip(previous, new)]
+
+
+def ticked(values, tick):
+    """Add the day's tick to the stats of an inhabitant.
+
+    Arguments:
+    values -- own_stats() of inhabitant
+    tick -- [hunger, thirst] gained
+
+    Returns:
+    tuple -- stats after the tick
+    """
+    values = list(values)
+    values[HUNGER] += tick[0]
+    values[THIRST] += tick[1]
+    return tuple(values)
+
+
+def perks_of(player):
+    """Get the perks of the player.
+
+    Arguments:
+    player -- Player, or None
+
+    Returns:
+    dict -- level of each perk
+    """
+    if player is None:
+        return {}
+    return {perk: getattr(player, perk) for perk in snapshot.PERKS}
+
+
+def room_fields(room):
+    """Get the journaled attributes of a room, for comparing.
+
+    Arguments:
+    room -- Room to read
+
+    Returns:
+    tuple -- values of snapshot.ROOM_FIELDS, with lists copied
+    """
+    return tuple(tuple(value) if isinstance(value, list) else value
+                 for value in map(room.__getattribute__, snapshot.ROOM_FIELDS))
+
+
+def scavenging_values(person):
+    """Get the scavenging fields of an inhabitant.
+
+    Arguments:
+    person -- Human to read
+
+    Returns:
+    tuple -- values of SCAVENGING_FIELDS
+    """
+    return (getattr(person, "scavenging", False), getattr(person, "days_scavenging", 0),
+            getattr(person, "days_to_scavenge_for", 0))
+
+
+def scavenging_fields(vault):
+    """Get the scavenging fields of everyone out scavenging.
+
+    Arguments:
+    vault -- VaultSimulation to read
+
+    Returns:
+    dict -- scavenging_values() by person ID
+    """
+    return {person_id: scavenging_values(vault.people.get(person_id))
+            for person_id in vault.scavengers if vault.people.get(person_id) is not None}
+
+
+def pack_stream(state):
+    """Pack the state of a random stream into a short JSON-friendly form.
+
+    Arguments:
+    state -- state returned by random.Random.getstate()
+
+    Returns:
+    list -- [version, base64 of the 32-bit words, gauss_next]
+    """
+    version, internal, gauss_next = state
+    words = struct.pack(f"<{len(internal)}I", *internal)
+    return [version, base64.b64encode(words).decode("ascii"), gauss_next]
+
+
+def unpack_stream(packed):
+    """Unpack the state of a random stream.
+
+    Arguments:
+    packed -- list returned by pack_stream()
+
+    Returns:
+    tuple -- state for random.Random.setstate()
+    """
+    version, encoded, gauss_next = packed
+    words = base64.b64decode(encoded)
+    return version, struct.unpack(f"<{len(words) // 4}I", words), gauss_next
+
+
+def inventory_delta(old, new):
+    """Get the change in count of each item between two inventories.
+
+    Arguments:
+    old -- count by item before
+    new -- count by item after
+
+    Returns:
+    dict -- non-zero change by item
+    """
+    delta = {}
+    for item in old.keys() | new.keys():
+        change = new.get(item, 0) - old.get(item, 0)
+        if change:
+            delta[item] = change
+    return delta
+
+
+def person_record(person, room_id):
+    """Get the journaled form of a newborn inhabitant.
+
+    Arguments:
+    person -- NPC to save
+    room_id -- ID of room they are assigned to, or None
+
+    Returns:
+    dict -- every field, stat and the room of the inhabitant
+    """
+    record = {field: getattr(person, field) for field in BIRTH_FIELDS}
+    record["id"] = person.person_id
+    record["children"] = list(person.children)
+    record.update(zip(SCAVENGING_FIELDS, scavenging_values(person)))
+    for name in COLUMNS:
+        record[name] = getattr(person, name)
+    record["room"] = room_id
+    return record
+
+
+def read_journal(path):
+    """Read the whole records of a journal.
+
+    Arguments:
+    path -- journal file
+
+    Returns:
+    tuple -- (header, records, length of the whole records), header is None
+             if there is no journal
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None, [], 0
+
+    lines = data.split(b"\n")
+    # The last piece is empty after a whole record, or what a crash cut off.
+    lines.pop()
+    if not lines:
+        return None, [], 0
+    header = json.loads(lines[0])
+    if header.get("journal", 0) > JOURNAL_VERSION:
+        raise JournalError(f"Journal version {header['journal']} is newer than this game supports ({JOURNAL_VERSION}).")
+    end = len(lines[0]) + 1
+    records = []
+    for line in lines[1:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+        end += len(line) + 1
+    return header, records, end
+
+
+def replay(vault, records):
+    """Apply journal records to a vault, in order.
+
+    Arguments:
+    vault -- VaultSimulation restored from the snapshot the journal extends
+    records -- records from read_journal()
+    """
+    for record in records:
+        apply_record(vault, record)
+
+
+def apply_record(vault, record):
+    """Apply one day of changes to a vault.
+
+    Arguments:
+    vault -- VaultSimulation to change
+    record -- journal record
+    """
+    for field, value in record.get("engine", {}).items():
+        setattr(vault, field, value)
+    vault.used_names.extend(record.get("used_names", ()))
+    for name in ("inventory", "trader_inventory"):
+        inventory = getattr(vault, name)
+        for item, change in record.get(name, {}).items():
+            if change > 0:
+                inventory.add(item, change)
+            else:
+                inventory.remove(item, -change)
+    for name, state in record.get("rng", {}).items():
+        vault.rng[name].setstate(unpack_stream(state))
+    for perk, value in record.get("perks", {}).items():
+        setattr(vault.player, perk, value)
+
+    for saved in record.get("built", ()):
+        room = snapshot.room_from_record(saved, vault.player)
+        # Assignments to the new room come with the inhabitants.
+        room.assigned = set()
+        vault.rooms.add(room)
+    for room_id, change in record.get("rooms", ()):
+        apply_room(vault.rooms, vault.rooms.get_id(room_id), change)
+
+    apply_people(vault, record)
+    if "next_ids" in record:
+        vault.people.next_id, vault.rooms.next_id = record["next_ids"]
+
+
+def apply_room(rooms, room, change):
+    """Change the attributes of a room, keeping the registry totals right.
+
+    Arguments:
+    rooms -- RoomRegistry the room is in
+    room -- Room to change
+    change -- new value by attribute
+    """
+    rooms.total_power_usage -= room.power_usage
+    rooms.total_storage -= room.storage_capacity()
+    for field, value in change.items():
+        setattr(room, field, value)
+    rooms.total_power_usage += room.power_usage
+    rooms.total_storage += room.storage_capacity()
+
+
+def apply_people(vault, record):
+    """Apply the births, deaths and inhabitant changes of a journal record.
+
+    Arguments:
+    vault -- VaultSimulation to change
+    record -- journal record
+    """
+    people = vault.people
+    store = people.store
+    row_ids = [person.person_id for person in store.people] if store is not None else None
+
+    for person_id in record.get("died", ()):
+        person = people.get(person_id)
+        vault.assignments.unassign(person)
+        vault.scavengers.discard(person_id)
+        people.remove(person)
+
+    # The newborn are saved as they were at the end of the day, so the tick
+    # goes to everyone else before they are added.
+    tick = record.get("tick")
+    if tick:
+        hunger, thirst = tick
+        if store is not None:
+            values = store.column("hunger")
+            values += hunger
+            values = store.column("thirst")
+            values += thirst
+        else:
+            for person in people:
+                person._hunger += hunger
+                person._thirst += thirst
+
+    rooms = {}
+    for saved in record.get("born", ()):
+        person = object.__new__(NPC)
+        person.store = None
+        person.row = None
+        person.person_id = saved["id"]
+        for field in BIRTH_FIELDS + SCAVENGING_FIELDS:
+            setattr(person, field, saved[field])
+        person.children = list(saved["children"])
+        for name in COLUMNS:
+            setattr(person, "_" + name, saved[name])
+        people.add(person)
+        rooms[person.person_id] = saved["room"]
+
+    if store is not None and "rows" in record:
+        place_rows(store, row_ids, record["rows"], people)
+
+    for person_id, change in record.get("people", ()):
+        person = people.get(person_id)
+        for field, value in change.items():
+            if field == "room":
+                rooms[person_id] = value
+            else:
+                setattr(person, field, value)
+
+    room_of = vault.assignments.room_of
+    for person_id, room_id in rooms.items():
+        room = room_of.pop(person_id, None)
+        if room is not None:
+            room.assigned.discard(person_id)
+        if room_id is not None:
+            room = vault.rooms.get_id(room_id)
+            room.assigned.add(person_id)
+            room_of[person_id] = room
+
+    scavengers = record.get("scavengers", {})
+    vault.scavengers.update(scavengers.get("out", ()))
+    vault.scavengers.difference_update(scavengers.get("back", ()))
+
+    stats = record.get("stats")
+    if stats:
+        changed = [people.get(person_id) for person_id in stats["ids"]]
+        if store is not None:
+            rows = [person.row for person in changed]
+            for name in COLUMNS:
+                if name in stats:
+                    store.columns[name][rows] = stats[name]
+        else:
+            for name in COLUMNS:
+                if name in stats:
+                    own = "_" + name
+                    for person, value in zip(changed, stats[name]):
+                        setattr(person, own, value)
+
+
+def place_rows(store, row_ids, moved, people):
+    """Put store rows back in the order they had when the record was made.
+
+    Births and deaths are replayed in a different order than they happened
+    in, so the store can end up with the same people in different rows.
+
+    Arguments:
+    store -- PopulationStore to reorder
+    row_ids -- person ID in each row before the record was applied
+    moved -- [person ID, row] of each row whose person changed
+    people -- Population the store belongs to
+    """
+    import numpy as np
+
+    target = row_ids[:store.size] + [None] * (store.size - len(row_ids))
+    for person_id, row in moved:
+        target[row] = person_id
+    order = [people.get(person_id) for person_id in target]
+    rows = np.array([person.row for person in order], dtype=np.intp)
+    for name, values in store.columns.items():
+        values[:store.size] = values[rows]
+    for row, person in enumerate(order):
+        person.row = row
+    store.people = order
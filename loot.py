@@ -0,0 +1,135 @@
+"""Loot sampler for random items.
+
+rand_item used to roll a rarity by halving odds, a roll of 1-1024 giving
+rarity 9 - k with chance 2**k / 1024 (k = 0 to 9) and nothing at all with
+chance 1 / 1024, and then pick uniformly among the items of that rarity.
+LootSampler keeps exactly those odds, but buckets the items by rarity once
+and draws from a precomputed alias table, so every draw is O(1).
+"""
+
+import random
+from collections import Counter
+
+from Item import catalog
+
+# Roll range used by the rarity odds.
+ROLL_RANGE = 1024
+
+
+def rarity_chance(rarity):
+    """Get the chance of rolling a rarity.
+
+    Arguments:
+    rarity -- rarity level, 0 (common) to 9 (rarest)
+
+    Returns:
+    float -- chance of rolling it
+    """
+    if not 0 <= rarity <= 9:
+        return 0.0
+    return 2 ** (9 - rarity) / ROLL_RANGE
+
+
+class LootSampler(object):
+    """Alias-method sampler over the item catalog.
+
+    Outcomes are item names, plus None for a roll that finds nothing (a
+    rarity without any items, or the 1 in 1024 roll past every rarity).
+    """
+
+    def __init__(self, names=None, rng=None):
+        """LootSampler constructor.
+
+        Arguments:
+        names -- names of items that can be found (default: None, whole catalog)
+        rng -- random.Random to draw with (default: None, the random module)
+        """
+        self.rng = rng if rng is not None else random
+        self.buckets = {}
+        for name in names if names is not None else catalog.names():
+            self.buckets.setdefault(catalog.record(name).rarity, []).append(name)
+
+        self.outcomes = []
+        weights = []
+        for rarity, bucket in sorted(self.buckets.items()):
+            for name in bucket:
+                self.outcomes.append(name)
+                weights.append(rarity_chance(rarity) / len(bucket))
+        self.outcomes.append(None)
+        weights.append(1 - sum(weights))
+        self.build_table(weights)
+
+    def build_table(self, weights):
+        """Build the alias table for the outcome weights (Vose's method).
+
+        Arguments:
+        weights -- chance of each outcome, summing to 1
+        """
+        size = len(weights)
+        scaled = [weight * size for weight in weights]
+        self.probability = [1.0] * size
+        self.alias = list(range(size))
+        small = [x for x, weight in enumerate(scaled) if weight < 1]
+        large = [x for x, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+
+    def chance(self, name):
+        """Get the chance of a single draw giving an item.
+
+        Arguments:
+        name -- name of item, or None for nothing
+
+        Returns:
+        float -- chance of drawing it
+        """
+        size = len(self.outcomes)
+        total = 0.0
+        for x in range(size):
+            if self.outcomes[x] == name:
+                total += self.probability[x]
+            if self.outcomes[self.alias[x]] == name:
+                total += 1 - self.probability[x]
+        return total / size
+
+    def sample(self):
+        """Draw one random item.
+
+        Returns:
+        str -- name of item found, or None if nothing was found
+        """
+        x = self.rng.randrange(len(self.outcomes))
+        if self.rng.random() < self.probability[x]:
+            return self.outcomes[x]
+        return self.outcomes[self.alias[x]]
+
+    def sample_many(self, number, inventory=None):
+        """Draw several random items and count them.
+
+        Arguments:
+        number -- number of draws
+        inventory -- Inventory to add the items to in one go (default: None)
+
+        Returns:
+        Counter -- number of each item found
+        """
+        found = Counter()
+        size = len(self.outcomes)
+        randrange = self.rng.randrange
+        uniform = self.rng.random
+        for _ in range(number):
+            x = randrange(size)
+            name = self.outcomes[x] if uniform() < self.probability[x] else self.outcomes[self.alias[x]]
+            if name is not None:
+                found[name] += 1
+        if inventory is not None:
+            inventory.add_many(found)
+        return found
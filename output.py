@@ -0,0 +1,195 @@
+"""Output sinks used by print_line and load_time.
+
+The current sink decides what happens to every line the game prints: the
+interactive sink keeps the typewriter pacing, the others skip the delays so
+headless runs and benchmarks don't wait on them. Delays are handed to the
+current clock either way, so skipped ones are still counted.
+"""
+
+import sys
+
+import clock
+
+
+class InteractiveSink(object):
+    """Sink printing each line after its pacing delay."""
+
+    paced = True
+
+    def write(self, line, delay):
+        """Print a line.
+
+        Arguments:
+        line -- line to print
+        delay -- pacing delay, already waited for
+        """
+        print(line)
+
+    def loading(self, message, delay):
+        """Print a loading message.
+
+        Arguments:
+        message -- message to print
+        delay -- loading delay, waited for after printing
+        """
+        print(message)
+
+    def flush(self):
+        """Nothing is held back, so there is nothing to flush."""
+
+
+class BufferedSink(object):
+    """Sink collecting lines and printing them all at once on flush()."""
+
+    paced = False
+
+    def __init__(self, stream=None):
+        """BufferedSink constructor.
+
+        Arguments:
+        stream -- file to write to on flush (default: None, sys.stdout)
+        """
+        self.stream = stream
+        self.lines = []
+
+    def write(self, line, delay):
+        """Hold a line until the next flush.
+
+        Arguments:
+        line -- line to print
+        delay -- pacing delay, only counted by the clock
+        """
+        self.lines.append(line)
+
+    def loading(self, message, delay):
+        """Hold a loading message until the next flush.
+
+        Arguments:
+        message -- message to print
+        delay -- pacing delay, only counted by the clock
+        """
+        self.lines.append(message)
+
+    def flush(self):
+        """Write every held line in one go."""
+        if self.lines:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("\n".join(self.lines) + "\n")
+            self.lines = []
+
+
+class NullSink(object):
+    """Sink throwing every line away."""
+
+    paced = False
+
+    def write(self, line, delay):
+        """Discard a line."""
+
+    def loading(self, message, delay):
+        """Discard a loading message."""
+
+    def flush(self):
+        """Nothing is held back, so there is nothing to flush."""
+
+
+class EventSink(object):
+    """Sink recording every line as a structured event."""
+
+    paced = False
+
+    def __init__(self):
+        """EventSink constructor."""
+        self.events = []
+
+    def write(self, line, delay):
+        """Record a printed line.
+
+        Arguments:
+        line -- line to print
+        delay -- pacing delay the line would have had
+        """
+        self.events.append({"kind": "line", "text": line, "delay": delay})
+
+    def loading(self, message, delay):
+        """Record a loading message.
+
+        Arguments:
+        message -- message to print
+        delay -- loading delay the message would have had
+        """
+        self.events.append({"kind": "loading", "text": message, "delay": delay})
+
+    def flush(self):
+        """Record the end of a batch of output, usually a day."""
+        self.events.append({"kind": "flush"})
+
+    def lines(self):
+        """Get the text of every recorded line and loading message.
+
+        Returns:
+        list -- recorded text
+        """
+        return [event["text"] for event in self.events if "text" in event]
+
+
+sink = InteractiveSink()
+
+
+def set_sink(new_sink):
+    """Send all further output to a sink.
+
+    Arguments:
+    new_sink -- sink to use
+
+    Returns:
+    previous -- sink that was in use before
+    """
+    global sink
+    previous = sink
+    sink = new_sink
+    return previous
+
+
+def get_sink():
+    """Get the sink currently in use."""
+    return sink
+
+
+def pace(delay):
+    """Wait on the current clock if the sink is paced, otherwise only count the delay.
+
+    Arguments:
+    delay -- delay in seconds
+    """
+    if sink.paced:
+        clock.clock.sleep(delay)
+    else:
+        clock.clock.advance(delay)
+
+
+def emit(line, delay):
+    """Send a line to the current sink.
+
+    Arguments:
+    line -- line to print
+    delay -- pacing delay in seconds
+    """
+    pace(delay)
+    sink.write(line, delay)
+
+
+def loading(message, delay):
+    """Send a loading message to the current sink.
+
+    Arguments:
+    message -- message to print
+    delay -- loading delay in seconds
+    """
+    sink.loading(message, delay)
+    pace(delay)
+
+
+def flush():
+    """Flush the current sink."""
+    sink.flush()
@@ -0,0 +1,260 @@
+"""Optional NumPy-backed column store for inhabitant stats.
+
+Without a store every Human keeps its own stats. Once a Human is attached to
+a PopulationStore, its StoreField stats live in one NumPy column per stat, so
+the daily upkeep of a whole vault runs as a handful of array operations.
+NumPy is only needed when a PopulationStore is created.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Stats kept in the store, and the NumPy type of each column.
+COLUMNS = {
+    "strength": "int64",
+    "perception": "int64",
+    "endurance": "int64",
+    "charisma": "int64",
+    "intelligence": "int64",
+    "luck": "int64",
+    "hunger": "int64",
+    "thirst": "int64",
+    "HP": "float64",
+    "XP": "int64",
+    "level": "int64",
+    "age": "int64",
+}
+
+# Hunger and thirst everyone gains each day.
+DAILY_HUNGER = 10
+DAILY_THIRST = 10
+
+
+class StoreField(object):
+    """Human stat kept on the Human itself, or in a store column once attached."""
+
+    def __init__(self, column):
+        """StoreField constructor.
+
+        Arguments:
+        column -- name of stat
+        """
+        self.column = column
+        self.own = "_" + column
+
+    def __get__(self, person, owner=None):
+        """Read the stat from the store if person is attached to one."""
+        if person is None:
+            return self
+        store = person.store
+        if store is None:
+            return getattr(person, self.own)
+        return store.columns[self.column][person.row].item()
+
+    def __set__(self, person, value):
+        """Write the stat to the store if person is attached to one."""
+        store = person.store
+        if store is None:
+            setattr(person, self.own, value)
+        else:
+            store.columns[self.column][person.row] = value
+
+
+class PopulationStore(object):
+    """Structure-of-arrays store holding the stats of every attached Human."""
+
+    def __init__(self, capacity=64):
+        """PopulationStore constructor.
+
+        Arguments:
+        capacity -- number of rows to allocate up front (default: 64)
+        """
+        if np is None:
+            raise ImportError("PopulationStore needs NumPy. Install it with 'pip install numpy'.")
+        self.size = 0
+        self.people = []
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.loader = None
+
+    def __getattr__(self, name):
+        """Create the Humans of a deferred load when they are first needed."""
+        loader = self.__dict__.get("loader")
+        if loader is None or name != "people":
+            raise AttributeError(name)
+        loader.load()
+        return self.people
+
+    def defer(self, loader):
+        """Leave the Humans of the rows to be created on first use, see Population.defer().
+
+        Arguments:
+        loader -- object whose load() sets people
+        """
+        self.__dict__.pop("people", None)
+        self.loader = loader
+
+    def __len__(self):
+        """Number of attached Humans."""
+        return self.size
+
+    def column(self, name):
+        """Get the live rows of a column.
+
+        Arguments:
+        name -- name of stat
+
+        Returns:
+        ndarray -- view of the column, one row per attached Human
+        """
+        return self.columns[name][:self.size]
+
+    def grow(self):
+        """Double the number of allocated rows."""
+        for name, values in self.columns.items():
+            grown = np.zeros(max(1, len(values) * 2), dtype=values.dtype)
+            grown[:len(values)] = values
+            self.columns[name] = grown
+
+    def attach(self, person):
+        """Move a Human's stats into the store.
+
+        Arguments:
+        person -- Human to attach
+        """
+        if self.size == len(self.columns["hunger"]):
+            self.grow()
+        row = self.size
+        for name in COLUMNS:
+            self.columns[name][row] = getattr(person, name)
+        self.people.append(person)
+        person.store = self
+        person.row = row
+        self.size += 1
+
+    def detach(self, person):
+        """Move a Human's stats back onto the Human and free their row.
+
+        The last row is moved into the freed one, so rows stay packed.
+
+        Arguments:
+        person -- Human to detach
+        """
+        row = person.row
+        for name in COLUMNS:
+            setattr(person, "_" + name, self.columns[name][row].item())
+        person.store = None
+        person.row = None
+
+        last = self.size - 1
+        moved = self.people.pop()
+        if row != last:
+            for values in self.columns.values():
+                values[row] = values[last]
+            self.people[row] = moved
+            moved.row = row
+        self.size = last
+
+    def detach_many(self, people):
+        """Detach several Humans at once.
+
+        The remaining rows are packed down in order with one array copy per
+        column, instead of one row move per Human.
+
+        Arguments:
+        people -- Humans to detach
+        """
+        rows = np.array([person.row for person in people], dtype=np.intp)
+        for name in COLUMNS:
+            own = "_" + name
+            for person, value in zip(people, self.columns[name][rows].tolist()):
+                setattr(person, own, value)
+        for person in people:
+            person.store = None
+            person.row = None
+
+        keep = np.ones(self.size, dtype=bool)
+        keep[rows] = False
+        for values in self.columns.values():
+            kept = values[:self.size][keep]
+            values[:len(kept)] = kept
+        first = int(rows.min()) if len(rows) else self.size
+        self.people = [person for person in self.people if person.store is self]
+        for row in range(first, len(self.people)):
+            self.people[row].row = row
+        self.size = len(self.people)
+
+    def select(self, mask):
+        """Get the Humans whose rows are set in a mask.
+
+        Arguments:
+        mask -- boolean array over the live rows
+
+        Returns:
+        list -- matching Humans
+        """
+        return [self.people[row] for row in np.flatnonzero(mask)]
+
+    def total(self, name):
+        """Sum a column.
+
+        Arguments:
+        name -- name of stat
+
+        Returns:
+        number -- sum of the stat over all attached Humans
+        """
+        return self.column(name).sum().item()
+
+    def ration(self, food, water, food_relief, water_relief):
+        """Lower everyone's hunger and thirst by their rations at once.
+
+        Arguments:
+        food -- units of food per row
+        water -- units of water per row
+        food_relief -- hunger taken away by one unit of food
+        water_relief -- thirst taken away by one unit of water
+        """
+        hunger_values = self.column("hunger")
+        thirst_values = self.column("thirst")
+        hunger_values -= np.asarray(food, dtype=hunger_values.dtype) * food_relief
+        thirst_values -= np.asarray(water, dtype=thirst_values.dtype) * water_relief
+        np.maximum(hunger_values, 0, out=hunger_values)
+        np.maximum(thirst_values, 0, out=thirst_values)
+
+    def tick(self, hunger=DAILY_HUNGER, thirst=DAILY_THIRST):
+        """Run one day of hunger and thirst for everyone at once.
+
+        Matches the per-person daily loop: someone who dies of hunger doesn't
+        get thirstier, and levelling is checked for the survivors.
+
+        Arguments:
+        hunger -- hunger gained by everyone (default: DAILY_HUNGER)
+        thirst -- thirst gained by everyone (default: DAILY_THIRST)
+
+        Returns:
+        dict -- Humans who died of hunger or thirst or can level up, and
+                how many are starving, hungry, parched or thirsty
+        """
+        hunger_values = self.column("hunger")
+        thirst_values = self.column("thirst")
+        hunger_values += hunger
+        died_of_hunger = hunger_values > 99
+        thirst_values[~died_of_hunger] += thirst
+        died_of_thirst = ~died_of_hunger & (thirst_values > 99)
+        alive = ~(died_of_hunger | died_of_thirst)
+
+        xp_needed = 1000 + np.power(3.0, self.column("level"))
+        levelled = alive & (self.column("XP") >= xp_needed)
+
+        return {
+            "died_of_hunger": self.select(died_of_hunger),
+            "died_of_thirst": self.select(died_of_thirst),
+            "levelled": self.select(levelled),
+            "starving": int(np.count_nonzero(alive & (hunger_values > 80))),
+            "hungry": int(np.count_nonzero(alive & (hunger_values > 50) & (hunger_values <= 80))),
+            "parched": int(np.count_nonzero(alive & (thirst_values > 80))),
+            "thirsty": int(np.count_nonzero(alive & (thirst_values > 50) & (thirst_values <= 80))),
+        }
@@ -0,0 +1,218 @@
+"""Monte Carlo forecast of what raids will cost a vault over the coming days.
+
+forecast_raids() plays the raid rules of VaultSimulation.step_day(), raid()
+and update_defense() forward for many trials at once, one NumPy array per
+quantity with a row per trial:
+
+- a raid comes on day 5, and from day 11 on one day in raid_odds
+- attack power is randint(1, day // 5)
+- defense is 10 per turret, 1 per gun and the summed strength of everyone,
+  boosted by the tactician and inspiration perks
+- a raid stronger than the defense takes attack - defense units of items,
+  every unit being equally likely, and past 10 units may kill someone other
+  than the first inhabitant
+
+Turrets and guns taken and strength lost with the dead lower the defense
+against later raids. Everything else that changes a vault from day to day
+(production, feeding, trading, births, other deaths) is left out, so the
+forecast answers "what would raids do to the vault as it stands". Trials
+draw from their own NumPy generator, so forecasting never changes what
+happens in the game.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class RaidForecast(object):
+    """Outcome of every trial of a raid forecast."""
+
+    def __init__(self, days, items, raids, lost, deaths):
+        """RaidForecast constructor.
+
+        Arguments:
+        days -- number of days forecast
+        items -- names of items held, in the column order of lost
+        raids -- raids per trial
+        lost -- units of each item lost per trial, one row per trial
+        deaths -- inhabitants killed per trial
+        """
+        self.days = days
+        self.items = items
+        self.raids = raids
+        self.lost = lost
+        self.deaths = deaths
+
+    @property
+    def trials(self):
+        """Number of trials run."""
+        return len(self.raids)
+
+    @property
+    def raid_probability(self):
+        """Chance of at least one raid."""
+        return float(np.mean(self.raids > 0))
+
+    @property
+    def death_probability(self):
+        """Chance of losing at least one inhabitant to raids."""
+        return float(np.mean(self.deaths > 0))
+
+    def items_lost(self):
+        """Get the total units of items lost in each trial.
+
+        Returns:
+        ndarray -- units lost per trial
+        """
+        return self.lost.sum(axis=1)
+
+    def loss_percentile(self, q):
+        """Get a percentile of the total units of items lost.
+
+        Arguments:
+        q -- percentile, 0 to 100
+
+        Returns:
+        float -- units lost in that percentile of trials
+        """
+        return float(np.percentile(self.items_lost(), q))
+
+    def expected_losses(self):
+        """Get the mean units lost of each item.
+
+        Returns:
+        dict -- mean units lost by item, for items that can be lost
+        """
+        means = self.lost.mean(axis=0) if self.trials else np.zeros(len(self.items))
+        return {item: float(mean) for item, mean in zip(self.items, means) if mean > 0}
+
+    def summary(self):
+        """Get the headline numbers of the forecast.
+
+        Returns:
+        dict -- raid and death chances, expected raids and deaths, and the
+                distribution of units lost
+        """
+        lost = self.items_lost()
+        return {
+            "days": self.days,
+            "trials": self.trials,
+            "raid_probability": self.raid_probability,
+            "expected_raids": float(self.raids.mean()),
+            "death_probability": self.death_probability,
+            "expected_deaths": float(self.deaths.mean()),
+            "items_lost_mean": float(lost.mean()),
+            "items_lost_p50": self.loss_percentile(50),
+            "items_lost_p90": self.loss_percentile(90),
+            "items_lost_p99": self.loss_percentile(99),
+            "expected_losses": self.expected_losses(),
+        }
+
+
+def forecast_raids(vault, days=30, trials=10000, seed=None, start=None):
+    """Forecast the raids of the coming days over many trials.
+
+    Arguments:
+    vault -- VaultSimulation to forecast for, left untouched
+    days -- number of days to look ahead (default: 30)
+    trials -- number of trials (default: 10000)
+    seed -- seed of the trials (default: None, a fresh seed)
+    start -- first day to forecast (default: None, the vault's day count,
+             ie. the next day step_day() plays)
+
+    Returns:
+    RaidForecast -- outcome of every trial
+    """
+    if np is None:
+        raise ImportError("Raid forecasts need NumPy. Install it with 'pip install numpy'.")
+    rng = np.random.default_rng(seed)
+
+    items = sorted(item for item, count in vault.inventory.items() if count > 0)
+    held = np.tile(np.array([vault.inventory.count(item) for item in items], dtype=np.int64), (trials, 1))
+    lost = np.zeros_like(held)
+    turrets = items.index("turret") if "turret" in items else None
+    guns = items.index("gun") if "gun" in items else None
+
+    # Raids only ever kill people after the first inhabitant.
+    people = vault.people
+    store = people.store
+    if store is not None and len(people):
+        strengths = np.delete(store.column("strength"), people[0].row)
+    else:
+        strengths = np.array([person.strength for person in people[1:]], dtype=np.int64)
+    strength = np.full(trials, vault.total("strength"), dtype=np.float64)
+    left = np.full(trials, len(strengths), dtype=np.int64)
+
+    boost = 1.0
+    if vault.player.tactician > 0:
+        boost *= 1 + (vault.player.tactician * 0.05)
+    if vault.player.inspiration > 0:
+        boost *= 1 + (vault.player.inspiration * 0.03)
+
+    raids = np.zeros(trials, dtype=np.int64)
+    deaths = np.zeros(trials, dtype=np.int64)
+    odds = vault.raid_odds
+    if start is None:
+        start = vault.day_count
+    for day in range(start, start + days):
+        if day == 5:
+            raiding = np.ones(trials, dtype=bool)
+        elif day >= 11 and odds > 0:
+            raiding = rng.integers(1, odds, size=trials, endpoint=True) == odds
+        else:
+            continue
+        raids += raiding
+
+        attack = rng.integers(1, day // 5, size=trials, endpoint=True)
+        defense = strength.copy()
+        if turrets is not None:
+            defense += 10 * held[:, turrets]
+        if guns is not None:
+            defense += held[:, guns]
+        defense *= boost
+        loss = np.where(raiding & (defense <= attack), (attack - defense).astype(np.int64), 0)
+
+        hit = np.flatnonzero(loss > 0)
+        if len(hit) == 0:
+            continue
+        take_items(rng, held, lost, hit, loss[hit])
+
+        dice = rng.integers(2, 25, size=len(hit), endpoint=True)
+        dying = hit[(loss[hit] > 10) & (loss[hit] // 10 < dice) & (left[hit] > 0)]
+        if len(dying) and len(strengths):
+            # Victims are drawn with replacement, which only matters once a
+            # trial has lost a good share of its people.
+            strength[dying] -= strengths[rng.integers(0, len(strengths), size=len(dying))]
+            left[dying] -= 1
+            deaths[dying] += 1
+
+    return RaidForecast(days, items, raids, lost, deaths)
+
+
+def take_items(rng, held, lost, hit, loss):
+    """Take units of items from the trials hit by a raid.
+
+    Units are taken item by item from a multivariate hypergeometric
+    distribution, so every unit held is equally likely to go, as with
+    Inventory.pop_random().
+
+    Arguments:
+    rng -- numpy.random.Generator to draw with
+    held -- units of each item held per trial, changed in place
+    lost -- units of each item lost per trial, changed in place
+    hit -- trials hit by the raid
+    loss -- units the raid takes in each trial hit
+    """
+    counts = held[hit]
+    remaining = counts.sum(axis=1)
+    wanted = np.minimum(loss, remaining)
+    for column in range(counts.shape[1]):
+        good = counts[:, column]
+        remaining -= good
+        drawn = rng.hypergeometric(good, remaining, wanted)
+        counts[:, column] -= drawn
+        lost[hit, column] += drawn
+        wanted -= drawn
+    held[hit] = counts
@@ -0,0 +1,208 @@
+"""Rationing planner for feeding the whole vault at once.
+
+The planner works out how many units of food and water every inhabitant gets
+in a single pass, using one of the fairness policies below, and the
+resulting RationPlan is applied with one bulk inventory debit.
+
+A policy is a function taking the units each inhabitant needs, the units
+available and whether each inhabitant is a worker, and returning the units
+each inhabitant gets.
+"""
+
+# Hunger or thirst taken away by one unit of food or water.
+FOOD_RELIEF = 10
+WATER_RELIEF = 10
+
+
+def units_needed(level, relief):
+    """Get the units needed to bring a hunger or thirst level down to 0.
+
+    Arguments:
+    level -- hunger or thirst level
+    relief -- level taken away by one unit
+
+    Returns:
+    int -- units needed
+    """
+    return -(-level // relief) if level > 0 else 0
+
+
+def neediest_order(needs, indexes):
+    """Sort inhabitants by need, neediest first.
+
+    Arguments:
+    needs -- units needed per inhabitant
+    indexes -- positions of inhabitants to sort
+
+    Returns:
+    list -- positions, neediest first, ties in original order
+    """
+    return sorted(indexes, key=lambda x: -needs[x])
+
+
+def neediest_first(needs, supply, workers=None):
+    """Bring the neediest inhabitants down first, levelling everyone off.
+
+    Finds the lowest level of need the supply can bring everyone down to and
+    tops up the neediest with what's left over.
+
+    Arguments:
+    needs -- units needed per inhabitant
+    supply -- units available
+    workers -- whether each inhabitant is a worker, unused (default: None)
+
+    Returns:
+    list -- units given per inhabitant
+    """
+    if sum(needs) <= supply:
+        return list(needs)
+    low, high = 0, max(needs)
+    while low < high:
+        mid = (low + high) // 2
+        if sum(need - mid for need in needs if need > mid) <= supply:
+            high = mid
+        else:
+            low = mid + 1
+    allocation = [max(0, need - low) for need in needs]
+    left = supply - sum(allocation)
+    candidates = [x for x, need in enumerate(needs) if need >= low]
+    for x in neediest_order(needs, candidates)[:left]:
+        allocation[x] += 1
+    return allocation
+
+
+def even_split(needs, supply, workers=None):
+    """Give everyone the same share, capped at what they need.
+
+    Finds the largest equal share the supply allows and hands what's left
+    over to the neediest of those who still need more.
+
+    Arguments:
+    needs -- units needed per inhabitant
+    supply -- units available
+    workers -- whether each inhabitant is a worker, unused (default: None)
+
+    Returns:
+    list -- units given per inhabitant
+    """
+    if sum(needs) <= supply:
+        return list(needs)
+    low, high = 0, max(needs)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if sum(min(need, mid) for need in needs) <= supply:
+            low = mid
+        else:
+            high = mid - 1
+    allocation = [min(need, low) for need in needs]
+    left = supply - sum(allocation)
+    candidates = [x for x, need in enumerate(needs) if need > low]
+    for x in neediest_order(needs, candidates)[:left]:
+        allocation[x] += 1
+    return allocation
+
+
+def workers_first(needs, supply, workers=None):
+    """Feed workers first, neediest first, then everyone else with what's left.
+
+    Arguments:
+    needs -- units needed per inhabitant
+    supply -- units available
+    workers -- whether each inhabitant is a worker (default: None, nobody)
+
+    Returns:
+    list -- units given per inhabitant
+    """
+    if workers is None:
+        workers = [False] * len(needs)
+    allocation = [0] * len(needs)
+    for group in (True, False):
+        indexes = [x for x in range(len(needs)) if workers[x] == group]
+        given = neediest_first([needs[x] for x in indexes], supply)
+        for x, units in zip(indexes, given):
+            allocation[x] = units
+        supply -= sum(given)
+    return allocation
+
+
+POLICIES = {
+    "neediest": neediest_first,
+    "even": even_split,
+    "workers": workers_first,
+}
+
+
+class RationPlan(object):
+    """Food and water allocation for a list of inhabitants."""
+
+    def __init__(self, people, food, water, store=None):
+        """RationPlan constructor.
+
+        Arguments:
+        people -- inhabitants covered, in the order of the allocations
+        food -- units of food given per inhabitant
+        water -- units of water given per inhabitant
+        store -- PopulationStore the inhabitants are in, in row order (default: None)
+        """
+        self.people = people
+        self.food = food
+        self.water = water
+        self.store = store
+        self.food_total = sum(food)
+        self.water_total = sum(water)
+
+    def debit(self):
+        """Get the items the plan takes from the inventory.
+
+        Returns:
+        dict -- units of food and water used
+        """
+        return {"food": self.food_total, "water": self.water_total}
+
+    def apply(self, inventory):
+        """Lower everyone's hunger and thirst and take the rations from the inventory.
+
+        Arguments:
+        inventory -- Inventory to take food and water from
+
+        Returns:
+        dict -- units of food and water actually removed
+        """
+        if self.store is not None:
+            self.store.ration(self.food, self.water, FOOD_RELIEF, WATER_RELIEF)
+        else:
+            for person, food, water in zip(self.people, self.food, self.water):
+                if food:
+                    person.hunger = max(0, person.hunger - food * FOOD_RELIEF)
+                if water:
+                    person.thirst = max(0, person.thirst - water * WATER_RELIEF)
+        return inventory.remove_many(self.debit())
+
+
+def plan_rations(people, food_supply, water_supply, policy="neediest", workers=()):
+    """Work out food and water for everyone in a single pass.
+
+    Arguments:
+    people -- Population of all people in the game
+    food_supply -- units of food available
+    water_supply -- units of water available
+    policy -- name of policy in POLICIES (default: "neediest")
+    workers -- person IDs of workers (default: nobody)
+
+    Returns:
+    RationPlan -- allocation for everyone
+    """
+    allocate = POLICIES[policy]
+    store = people.store
+    if store is not None:
+        order = list(store.people)
+        hunger = store.column("hunger").tolist()
+        thirst = store.column("thirst").tolist()
+    else:
+        order = list(people)
+        hunger = [person.hunger for person in order]
+        thirst = [person.thirst for person in order]
+    is_worker = [person.person_id in workers for person in order]
+    food = allocate([units_needed(level, FOOD_RELIEF) for level in hunger], food_supply, is_worker)
+    water = allocate([units_needed(level, WATER_RELIEF) for level in thirst], water_supply, is_worker)
+    return RationPlan(order, food, water, store)
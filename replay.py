@@ -0,0 +1,211 @@
+"""Record the commands and answers of a session, and replay them headlessly.
+
+A Recorder writes down the seed of a vault and every command and answer the
+vault reads, with the day it was read on. Every roll in the game comes from
+the vault's seeded RandomStreams, so feeding the same lines back to a vault
+with the same seed plays the session out the same way. replay() does that
+with the output thrown away, and can stop at the start of any day so a slow
+or buggy day can be played on its own, eg. under a profiler.
+
+Log layout: a JSON header line with the seed, then one event per line:
+    C <tab> day <tab> command
+    A <tab> day <tab> answer
+    D <tab> day                 (the day has ended)
+"""
+
+import json
+
+from Simulation import VaultSimulation
+import output
+
+LOG_VERSION = 1
+
+
+class ReplayError(ValueError):
+    """Raised when a log can't be read or a replay goes out of step with it."""
+
+
+class Recorder(object):
+    """Writes every command and answer a vault reads to a log file."""
+
+    def __init__(self, path):
+        """Recorder constructor.
+
+        Arguments:
+        path -- log file to write
+        """
+        self.path = path
+        self.file = None
+
+    def start(self, vault):
+        """Start recording a new vault, before setup() asks for the player.
+
+        Arguments:
+        vault -- VaultSimulation to record
+        """
+        # Line buffered, so a crash loses at most the line being written.
+        self.file = open(self.path, "w", encoding="utf-8", buffering=1)
+        header = {"replay": LOG_VERSION, "seed": vault.rng.seed, "vectorized": vault.people.store is not None}
+        self.file.write(json.dumps(header) + "\n")
+        vault.recorder = self
+
+    def command(self, day, line):
+        """Record a command.
+
+        Arguments:
+        day -- day it was read on
+        line -- command
+        """
+        self.file.write(f"C\t{day}\t{line}\n")
+
+    def answer(self, day, line):
+        """Record an answer to a follow-up question.
+
+        Arguments:
+        day -- day it was read on
+        line -- answer
+        """
+        self.file.write(f"A\t{day}\t{line}\n")
+
+    def end_day(self, day):
+        """Record the end of a day.
+
+        Arguments:
+        day -- day that has ended
+        """
+        self.file.write(f"D\t{day}\n")
+
+    def close(self):
+        """Close the log file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ReplayCommands(object):
+    """Command source reading commands and answers back from a log.
+
+    Each read is checked against the log: a command where the log has an
+    answer, or a read on a different day than it was recorded on, means the
+    replay no longer matches the session and raises ReplayError.
+    """
+
+    def __init__(self, events):
+        """ReplayCommands constructor.
+
+        Arguments:
+        events -- (kind, day, line) of each event, from read_log()
+        """
+        self.events = events
+        self.position = 0
+        self.days = sum(1 for kind, day, line in events if kind == "D")
+        self.vault = None
+
+    def next_command(self):
+        """Read the next command.
+
+        Returns:
+        str -- next command, or None at the end of the day or of the log
+        """
+        if self.position == len(self.events) or self.events[self.position][0] == "D":
+            return None
+        return self.read("C")
+
+    def ask(self, prompt):
+        """Answer a follow-up question with the next answer.
+
+        Arguments:
+        prompt -- question being asked
+
+        Returns:
+        str -- next answer
+        """
+        if self.position == len(self.events):
+            raise EOFError(f"No recorded answer left for: {prompt}")
+        return self.read("A")
+
+    def end_day(self, day):
+        """Move past the end of a day.
+
+        Arguments:
+        day -- day that has just been played
+        """
+        self.read("D", day)
+        self.days -= 1
+
+    def read(self, kind, day=None):
+        """Read the next event, checking it is the one expected.
+
+        Arguments:
+        kind -- "C", "A" or "D"
+        day -- day the event should be on (default: None, the vault's day)
+
+        Returns:
+        str -- line of the event
+        """
+        if day is None and self.vault is not None:
+            day = self.vault.day_count
+        found, found_day, line = self.events[self.position]
+        if found != kind or (day is not None and found_day != day):
+            raise ReplayError(f"Replay is out of step with the log at event {self.position + 1}: "
+                              f"expected {kind} on day {day}, found {found} on day {found_day}.")
+        self.position += 1
+        return line
+
+
+def read_log(path):
+    """Read a log written by a Recorder.
+
+    Arguments:
+    path -- log file
+
+    Returns:
+    tuple -- (header, events), with events as (kind, day, line) tuples
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().split("\n")
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        raise ReplayError(f"{path} is not a replay log.")
+    if header.get("replay", 0) > LOG_VERSION:
+        raise ReplayError(f"Log version {header['replay']} is newer than this game supports ({LOG_VERSION}).")
+
+    events = []
+    # The last piece is empty, or a line cut off by a crash.
+    for line in lines[1:-1]:
+        kind, day, *rest = line.split("\t", 2)
+        events.append((kind, int(day), rest[0] if rest else None))
+    return header, events
+
+
+def replay(path, to_day=None, vectorized=None):
+    """Re-run a recorded session headlessly.
+
+    Arguments:
+    path -- log file written by a Recorder
+    to_day -- stop at the start of this day (default: None, play every recorded day)
+    vectorized -- keep stats in a PopulationStore (default: None, as when recorded)
+
+    Returns:
+    VaultSimulation -- vault where the replay stopped; its command source
+                       holds the rest of the log, so step_day() plays on
+    """
+    header, events = read_log(path)
+    if vectorized is None:
+        vectorized = header.get("vectorized", False)
+    commands = ReplayCommands(events)
+    vault = VaultSimulation(commands, vectorized=vectorized, seed=header["seed"])
+    commands.vault = vault
+
+    previous = output.set_sink(output.NullSink())
+    try:
+        vault.setup()
+        while commands.days and (to_day is None or vault.day_count < to_day):
+            going = vault.step_day()
+            commands.end_day(vault.day_count - 1)
+            if not going:
+                break
+    finally:
+        output.set_sink(previous)
+    return vault
@@ -0,0 +1,99 @@
+"""Seeded random number streams, one per subsystem.
+
+Every subsystem draws from its own random.Random, seeded from the run's
+seed and the stream's name. A change in how often one subsystem rolls
+doesn't shift the rolls of the others. Runs with the same seed and commands
+play out the same, and the state of every stream can be saved and restored.
+"""
+
+import random
+
+# Subsystems with their own stream.
+STREAMS = ("raid", "loot", "trader", "scavenging", "crafting", "births", "rooms")
+
+# Version of the format returned by RandomStreams.getstate().
+STATE_VERSION = 1
+
+
+class RandomStreams(object):
+    """Independent seeded random streams, looked up by subsystem name."""
+
+    def __init__(self, seed=None):
+        """RandomStreams constructor.
+
+        Arguments:
+        seed -- integer seed of the run (default: None, a fresh random seed)
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.streams = {name: random.Random(f"{seed}:{name}") for name in STREAMS}
+
+    def __getitem__(self, name):
+        """Get the stream of a subsystem."""
+        return self.streams[name]
+
+    def getstate(self):
+        """Get the state of every stream, in a form that can be saved as JSON.
+
+        Returns:
+        dict -- seed and state of each stream
+        """
+        streams = {}
+        for name, stream in self.streams.items():
+            version, internal, gauss_next = stream.getstate()
+            streams[name] = [version, list(internal), gauss_next]
+        return {"version": STATE_VERSION, "seed": self.seed, "streams": streams}
+
+    def setstate(self, state):
+        """Restore the state of every stream.
+
+        Arguments:
+        state -- dict returned by getstate()
+        """
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported random state version: {state.get('version')}")
+        self.seed = state["seed"]
+        for name, (version, internal, gauss_next) in state["streams"].items():
+            self.streams[name].setstate((version, tuple(internal), gauss_next))
+
+
+# Most trials binomial() draws for at once; (1 - p) ** n stays far from underflow below it.
+BINOMIAL_CHUNK = 500
+
+
+def binomial(rng, n, p):
+    """Count the successes of n trials with chance p each.
+
+    Draws by inverting the binomial distribution, one uniform draw per
+    BINOMIAL_CHUNK trials, so bulk actions roll once instead of per unit.
+
+    Arguments:
+    rng -- random.Random to draw with
+    n -- number of trials
+    p -- chance of success of each trial
+
+    Returns:
+    int -- number of successes
+    """
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+    if p > 0.5:
+        return n - binomial(rng, n, 1 - p)
+    ratio = p / (1 - p)
+    successes = 0
+    while n > 0:
+        trials = min(n, BINOMIAL_CHUNK)
+        n -= trials
+        draw = rng.random()
+        k = 0
+        chance = (1 - p) ** trials
+        total = chance
+        while draw > total and k < trials:
+            chance *= ratio * (trials - k) / (k + 1)
+            k += 1
+            total += chance
+        successes += k
+    return successes
@@ -0,0 +1,53 @@
+"""Tests of the command handlers. Run from the repository directory: pytest"""
+
+import output
+from Simulation import VaultSimulation, ScriptedCommands
+from commands import registry
+from Human import Player
+
+
+def make_vault(answers, food, vectorized=False):
+    """Set up a quiet vault answering follow-up questions from a list.
+
+    Arguments:
+    answers -- answers to follow-up questions, in order
+    food -- units of food to hold
+    vectorized -- keep inhabitant stats in a PopulationStore (default: False)
+
+    Returns:
+    VaultSimulation -- vault with its player and first inhabitants
+    """
+    output.set_sink(output.NullSink())
+    vault = VaultSimulation(ScriptedCommands(answers=lambda prompt: "strength"),
+                            vectorized=vectorized, seed=1)
+    vault.setup(Player("Bob", 1, "Smith", "Jones", 21, "m"))
+    vault.inventory.remove("food", vault.inventory.count("food"))
+    vault.inventory.add("food", food)
+    vault.commands.extend(answers)
+    return vault
+
+
+def test_feed_spends_the_amount_fed():
+    for vectorized in (False, True):
+        vault = make_vault(["4"], 9, vectorized)
+        vault.player.hunger = 90
+        registry.dispatch(vault, "feed Bob")
+        assert vault.inventory.count("food") == 5
+        assert vault.player.hunger == 50
+
+
+def test_feed_refuses_more_than_is_held():
+    vault = make_vault(["9"], 3)
+    vault.player.hunger = 90
+    registry.dispatch(vault, "feed Bob")
+    assert vault.inventory.count("food") == 3
+    assert vault.player.hunger == 90
+
+
+def test_drink_relieves_as_much_as_rationing():
+    vault = make_vault([], 0)
+    vault.inventory.add("water", 2)
+    vault.player.thirst = 50
+    vault.drink("Bob", "Smith", 2)
+    assert vault.inventory.count("water") == 0
+    assert vault.player.thirst == 30
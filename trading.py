@@ -0,0 +1,235 @@
+"""Trading with the vault's trader: prices, orders and settlement.
+
+Prices come from a table worked out once per barter level: an item's value
+marked up in four steps when buying and down in four steps when selling,
+with every level of the player's barter perk narrowing the gap. An order
+is one or more lines, eg. "buy 5 food, sell 3 gun", and is settled as a
+whole: caps and goods only change hands if every line can go through, with
+what is sold paying towards what is bought.
+
+settle() needs nothing but a vault and an order, so it can be called from
+code as often as needed, without the interactive trade screen.
+"""
+
+from collections import Counter, namedtuple
+from numbers import Integral
+
+from Item import catalog
+
+# Markup steps of buying and markdown steps of selling, applied one after another.
+BUY_STEPS = (1.2, 1.15, 1.1, 1.05)
+SELL_STEPS = (0.8, 0.85, 0.9, 0.95)
+
+# Share of a price each barter level takes off buying and adds to selling.
+BARTER_STEP = 0.03
+# Highest barter level that still improves prices.
+MAX_BARTER = 10
+
+OrderLine = namedtuple("OrderLine", ["action", "amount", "item"])
+
+
+class TradeError(ValueError):
+    """Raised when an order can't be read or can't be settled."""
+
+
+class PriceTable(object):
+    """Buy and sell price of one unit of every item, per barter level."""
+
+    def __init__(self, items=catalog):
+        """PriceTable constructor. Each level is worked out on first use.
+
+        Arguments:
+        items -- ItemCatalog to read values from (default: the shared catalog)
+        """
+        self.items = items
+        self.records = None
+        self.levels = {}
+
+    def prices(self, barter):
+        """Get the prices at a barter level.
+
+        Arguments:
+        barter -- barter perk level of the player
+
+        Returns:
+        dict -- (buy price, sell price) of each item
+        """
+        if self.items.records is None:
+            self.items.names()
+        if self.items.records is not self.records:
+            self.records = self.items.records
+            self.levels = {}
+        level = min(max(barter, 0), MAX_BARTER)
+        prices = self.levels.get(level)
+        if prices is None:
+            buy = 1 - BARTER_STEP * level
+            sell = 1 + BARTER_STEP * level
+            for step in BUY_STEPS:
+                buy *= step
+            for step in SELL_STEPS:
+                sell *= step
+            prices = self.levels[level] = {
+                name: (int(record.value * buy), int(record.value * sell))
+                for name, record in self.records.items()}
+        return prices
+
+
+prices = PriceTable()
+
+
+class Settlement(object):
+    """Caps and goods moved by a settled order."""
+
+    def __init__(self, lines, bought, sold, cost, revenue):
+        """Settlement constructor.
+
+        Arguments:
+        lines -- OrderLines with the unit price of each, as (line, price) pairs
+        bought -- Counter of units bought
+        sold -- Counter of units sold
+        cost -- caps paid for what was bought
+        revenue -- caps received for what was sold
+        """
+        self.lines = lines
+        self.bought = bought
+        self.sold = sold
+        self.cost = cost
+        self.revenue = revenue
+
+    @property
+    def caps(self):
+        """Change in the vault's caps."""
+        return self.revenue - self.cost
+
+
+def parse_order(text, items):
+    """Read an order of one or more lines, eg. "buy 5 food, sell 3 gun".
+
+    Lines are split by commas, semicolons or newlines. The amount can be
+    left out to trade one unit.
+
+    Arguments:
+    text -- order
+    items -- names of items that exist
+
+    Returns:
+    list -- OrderLines
+    """
+    lines = []
+    for part in text.replace(";", ",").replace("\n", ",").split(","):
+        words = part.split()
+        if not words:
+            continue
+        if len(words) == 2:
+            words.insert(1, "1")
+        if len(words) != 3:
+            raise TradeError("You have to input 3 words. Buy/sell, amount, item")
+        action, amount, item = words
+        if not amount.isdigit():
+            raise TradeError("You have to input a number as the second word")
+        lines.append(check_line(action, int(amount), item, items))
+    if not lines:
+        raise TradeError("You have to input something")
+    return lines
+
+
+def check_line(action, amount, item, items):
+    """Check one line of an order.
+
+    Arguments:
+    action -- "buy" or "sell", in any case
+    amount -- units to trade
+    item -- name of item
+    items -- names of items that can be traded
+
+    Returns:
+    OrderLine -- checked line
+    """
+    if not isinstance(action, str) or action.lower() not in ("buy", "sell"):
+        raise TradeError("Invalid Input. Only 'buy' and 'sell' are accepted")
+    if isinstance(amount, bool) or not isinstance(amount, Integral) or amount < 1:
+        raise TradeError("You have to trade a whole number of at least one unit")
+    if item not in items:
+        raise TradeError(f"Sorry. {item} doesn't exist!")
+    return OrderLine(action.lower(), int(amount), item)
+
+
+def quote(lines, barter, table=prices):
+    """Price an order without settling it.
+
+    Arguments:
+    lines -- OrderLines
+    barter -- barter perk level of the player
+    table -- PriceTable to price with (default: the shared table)
+
+    Returns:
+    Settlement -- what the order would move
+    """
+    level = table.prices(barter)
+    priced = []
+    bought = Counter()
+    sold = Counter()
+    cost = 0
+    revenue = 0
+    for line in lines:
+        if line.item not in level:
+            raise TradeError(f"Sorry. {line.item} doesn't exist!")
+        buy, sell = level[line.item]
+        if line.action == "buy":
+            bought[line.item] += line.amount
+            cost += buy * line.amount
+            priced.append((line, buy))
+        elif line.action == "sell":
+            sold[line.item] += line.amount
+            revenue += sell * line.amount
+            priced.append((line, sell))
+        else:
+            raise TradeError("Invalid Input. Only 'buy' and 'sell' are accepted")
+    return Settlement(priced, bought, sold, cost, revenue)
+
+
+def settle(vault, order):
+    """Settle an order with the vault's trader, all of it or nothing.
+
+    Arguments:
+    vault -- VaultSimulation trading
+    order -- order text, or OrderLines / (action, amount, item) tuples
+
+    Returns:
+    Settlement -- caps and goods moved
+    """
+    if isinstance(order, str):
+        lines = parse_order(order, vault.all_items)
+    else:
+        lines = [check_line(*line, vault.all_items) for line in order]
+        if not lines:
+            raise TradeError("You have to input something")
+    settlement = quote(lines, vault.player.barter)
+    bought = settlement.bought
+    sold = settlement.sold
+
+    if vault.caps + settlement.caps < 0:
+        raise TradeError("You can't afford that!")
+    if vault.trader_caps - settlement.caps < 0:
+        raise TradeError("The trader can't afford that!")
+    for item, amount in bought.items():
+        count = vault.trader_inventory.count(item) + sold[item]
+        if amount > count:
+            if not count:
+                raise TradeError(f"The trader doesn't have any {item}")
+            raise TradeError(f"The trader doesn't have {amount} of {item}")
+    for item, amount in sold.items():
+        count = vault.inventory.count(item) + bought[item]
+        if amount > count:
+            if not count:
+                raise TradeError(f"You don't have any {item}")
+            raise TradeError(f"You don't have {amount} of {item}")
+
+    if not vault.inventory.exchange(bought, sold):
+        raise TradeError("Your side of the trade couldn't be settled")
+    if not vault.trader_inventory.exchange(sold, bought):
+        vault.inventory.exchange(sold, bought)
+        raise TradeError("The trader's side of the trade couldn't be settled")
+    vault.caps += settlement.caps
+    vault.trader_caps -= settlement.caps
+    return settlement